@@ -10,8 +10,10 @@ from .tools.update_task import update_task
 from .tools.complete_task import complete_task
 from .tools.delete_task import delete_task
 from mcp.server import mcp_server
-from database.session import get_async_session
+from database.session import write_session, read_session, unit_of_work
 from sqlalchemy.ext.asyncio import AsyncSession
+from core.serialization import dumps_str, loads
+import asyncio
 import uuid
 import os
 
@@ -44,7 +46,7 @@ class TodoAgent:
         """
         Execute the add_task tool
         """
-        async with get_async_session() as session:
+        async with write_session() as session:
             return await add_task(
                 title=params.get('title'),
                 description=params.get('description'),
@@ -56,7 +58,7 @@ class TodoAgent:
         """
         Execute the list_tasks tool
         """
-        async with get_async_session() as session:
+        async with read_session(params.get('user_id')) as session:
             return await list_tasks(
                 user_id=params.get('user_id'),
                 filter_criteria=params.get('filter'),
@@ -67,7 +69,7 @@ class TodoAgent:
         """
         Execute the update_task tool
         """
-        async with get_async_session() as session:
+        async with write_session() as session:
             return await update_task(
                 task_id=params.get('task_id'),
                 user_id=params.get('user_id'),
@@ -81,7 +83,7 @@ class TodoAgent:
         """
         Execute the complete_task tool
         """
-        async with get_async_session() as session:
+        async with write_session() as session:
             return await complete_task(
                 task_id=params.get('task_id'),
                 user_id=params.get('user_id'),
@@ -92,7 +94,7 @@ class TodoAgent:
         """
         Execute the delete_task tool
         """
-        async with get_async_session() as session:
+        async with write_session() as session:
             return await delete_task(
                 task_id=params.get('task_id'),
                 user_id=params.get('user_id'),
@@ -199,12 +201,13 @@ class TodoAgent:
             ]
             
             # Call the OpenAI API with the message and tools
+            messages = [
+                {"role": "system", "content": "You are a helpful assistant that manages todo lists. Use the available functions to help the user manage their tasks. Always respond with the appropriate function call based on the user's request."},
+                {"role": "user", "content": message}
+            ]
             response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that manages todo lists. Use the available functions to help the user manage their tasks. Always respond with the appropriate function call based on the user's request."},
-                    {"role": "user", "content": message}
-                ],
+                messages=messages,
                 tools=tools,
                 tool_choice="auto"
             )
@@ -213,52 +216,135 @@ class TodoAgent:
             response_message = response.choices[0].message
             tool_calls = response_message.tool_calls
             
-            if tool_calls:
-                # Execute the tool calls
-                for tool_call in tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = eval(tool_call.function.arguments)  # In production, use json.loads
-                    
-                    # Add user_id to function args if not present
-                    if 'user_id' not in function_args:
-                        function_args['user_id'] = user_id
-                    
-                    # Execute the appropriate function
-                    if function_name == "add_task":
-                        result = await self.execute_add_task(**function_args)
-                        return result.get('message', 'Task added successfully!')
-                    elif function_name == "list_tasks":
-                        result = await self.execute_list_tasks(**function_args)
-                        tasks = result.get('tasks', [])
-                        if tasks:
-                            task_list = "\n".join([f"- {task['title']} ({'completed' if task['completed'] else 'pending'})" 
-                                                  for task in tasks])
-                            return f"Your tasks:\n{task_list}"
-                        else:
-                            return "You have no tasks."
-                    elif function_name == "update_task":
-                        result = await self.execute_update_task(**function_args)
-                        return result.get('message', 'Task updated successfully!')
-                    elif function_name == "complete_task":
-                        result = await self.execute_complete_task(**function_args)
-                        return result.get('message', 'Task completed!')
-                    elif function_name == "delete_task":
-                        result = await self.execute_delete_task(**function_args)
-                        return result.get('message', 'Task deleted!')
-                    else:
-                        return f"Unknown function: {function_name}"
-            else:
+            if not tool_calls:
                 # If no tool calls were made, return the assistant's message
                 return response_message.content or "I processed your request."
         except Exception as e:
             # Fallback to keyword-based approach if OpenAI fails
             print(f"OpenAI processing failed: {str(e)}")
             return await self.process_with_keywords(message, user_id)
+
+        # Execute every tool call of the turn in one unit of work, committed before the
+        # follow-up completion so no connection is held while waiting on the model
+        try:
+            async with unit_of_work():
+                results = await self.execute_tool_calls(tool_calls, user_id)
+        except Exception as e:
+            results = [{"success": False, "error": f"Changes were not saved: {e}"} for _ in tool_calls]
+
+        # Let the model summarize all results at once
+        messages.append({
+            "role": "assistant",
+            "content": response_message.content,
+            "tool_calls": [tool_call.model_dump() for tool_call in tool_calls]
+        })
+        messages.extend(
+            {"role": "tool", "tool_call_id": tool_call.id, "content": dumps_str(result)}
+            for tool_call, result in zip(tool_calls, results)
+        )
+
+        try:
+            follow_up = await self.client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=messages
+            )
+            content = follow_up.choices[0].message.content
+            if content:
+                return content
+        except Exception as e:
+            # The tools already ran, so describe their results rather than falling back to keywords
+            print(f"OpenAI follow-up failed: {str(e)}")
+        return "\n".join(
+            self.describe_tool_result(tool_call.function.name, result)
+            for tool_call, result in zip(tool_calls, results)
+        )
+
+    async def execute_tool_calls(self, tool_calls: List[Any], user_id: str) -> List[Dict[str, Any]]:
+        """
+        Execute all tool calls of a turn and return their results in call order
+
+        Calls that target the same task run in the order the model gave them;
+        everything else (other tasks, new tasks, listings) runs concurrently.
+        A failing call yields an error result instead of stopping the others.
+        Inside a unit of work the calls share its session and take turns on
+        it for their queries; each runs in its own savepoint, so a failed
+        call's changes are rolled back without affecting the rest.
+        """
+        handlers = {
+            "add_task": self.execute_add_task,
+            "list_tasks": self.execute_list_tasks,
+            "update_task": self.execute_update_task,
+            "complete_task": self.execute_complete_task,
+            "delete_task": self.execute_delete_task
+        }
+        results: List[Dict[str, Any]] = [{} for _ in tool_calls]
+
+        # Chain the calls per task so dependent ones stay ordered
+        chains: Dict[Any, List[int]] = {}
+        for index, tool_call in enumerate(tool_calls):
+            try:
+                function_args = loads(tool_call.function.arguments or "{}")
+            except ValueError:
+                function_args = {}
+            task_id = function_args.get('task_id') if isinstance(function_args, dict) else None
+            chains.setdefault(task_id if task_id is not None else ("call", index), []).append(index)
+
+        async def run(index: int):
+            tool_call = tool_calls[index]
+            handler = handlers.get(tool_call.function.name)
+            if handler is None:
+                return {"success": False, "error": f"Unknown function: {tool_call.function.name}"}
+            try:
+                function_args = loads(tool_call.function.arguments or "{}")
+                if not isinstance(function_args, dict):
+                    raise ValueError("Tool arguments must be a JSON object")
+                # Tools always act for the user the agent is serving
+                function_args['user_id'] = user_id
+                return await handler(**function_args)
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+
+        async def run_chain(indexes: List[int]):
+            for index in indexes:
+                results[index] = await run(index)
+
+        await asyncio.gather(*(run_chain(indexes) for indexes in chains.values()))
+        return results
+
+    def describe_tool_result(self, function_name: str, result: Dict[str, Any]) -> str:
+        """
+        Describe a tool result for the user without the model's help
+        """
+        if result.get('success') is False and 'error' in result:
+            return f"Error running {function_name}: {result['error']}"
+        if function_name == "list_tasks":
+            tasks = result.get('tasks', [])
+            if tasks:
+                task_list = "\n".join([f"- {task['title']} ({'completed' if task['completed'] else 'pending'})" 
+                                      for task in tasks])
+                return f"Your tasks:\n{task_list}"
+            return "You have no tasks."
+        defaults = {
+            "add_task": 'Task added successfully!',
+            "update_task": 'Task updated successfully!',
+            "complete_task": 'Task completed!',
+            "delete_task": 'Task deleted!'
+        }
+        return result.get('message', defaults.get(function_name, "Done."))
     
     async def process_with_keywords(self, message: str, user_id: str) -> str:
         """
         Process a natural language message using keyword detection
+
+        All tools used for the message share one session and commit once.
         """
+        try:
+            async with unit_of_work():
+                return await self._process_keywords(message, user_id)
+        except Exception as e:
+            return f"Error: changes were not saved: {str(e)}"
+
+    async def _process_keywords(self, message: str, user_id: str) -> str:
         message_lower = message.lower()
         
         if any(word in message_lower for word in ['add', 'create', 'new', 'make']):
@@ -3,13 +3,9 @@ MCP tool for adding tasks
 """
 
 from typing import Dict, Any
-from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-import uuid
-from models.todo import Todo
-from database.session import get_async_session
-from core.security import get_current_user
+from database import todo_repository
 
 
 async def add_task(
@@ -25,15 +21,14 @@ async def add_task(
         raise ValueError("Session and user_id are required")
     
     # Create new todo
-    todo = Todo(
+    todo = await todo_repository.create_todo(
+        session,
+        user_id=UUID(user_id),  # Convert string to UUID
         title=title,
-        description=description,
-        user_id=UUID(user_id)  # Convert string to UUID
+        description=description
     )
     
-    session.add(todo)
-    await session.commit()
-    await session.refresh(todo)
+    await todo_repository.commit(session)
     
     return {
         "success": True,
@@ -45,4 +40,4 @@ async def add_task(
             "description": todo.description,
             "completed": todo.completed
         }
-    }
\ No newline at end of file
+    }
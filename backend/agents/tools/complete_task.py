@@ -3,11 +3,9 @@ MCP tool for completing tasks
 """
 
 from typing import Dict, Any
-from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from models.todo import Todo
-from database.session import get_async_session
+from database import todo_repository
 
 
 async def complete_task(
@@ -21,23 +19,19 @@ async def complete_task(
     if not session or not user_id:
         raise ValueError("Session and user_id are required")
     
-    # Find the task
-    stmt = select(Todo).where(Todo.id == UUID(task_id), Todo.user_id == UUID(user_id))
-    result = await session.execute(stmt)
-    todo = result.scalar_one_or_none()
+    # Update completion status in a single UPDATE ... RETURNING
+    todo = await todo_repository.update_todo(
+        session, UUID(task_id), UUID(user_id), {"completed": True}
+    )
     
     if not todo:
         raise ValueError(f"Task with ID {task_id} not found or does not belong to user")
     
-    # Update completion status
-    todo.completed = True
-    
-    await session.commit()
-    await session.refresh(todo)
+    await todo_repository.commit(session)
     
     return {
         "success": True,
         "message": f"Task '{todo.title}' marked as completed",
         "task_id": str(todo.id),
         "completed": todo.completed
-    }
\ No newline at end of file
+    }
@@ -7,7 +7,6 @@ from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from models.todo import Todo
-from database.session import get_async_session
 
 
 async def list_tasks(
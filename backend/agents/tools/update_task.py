@@ -3,11 +3,9 @@ MCP tool for updating tasks
 """
 
 from typing import Dict, Any
-from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from models.todo import Todo
-from database.session import get_async_session
+from database import todo_repository
 
 
 async def update_task(
@@ -24,24 +22,21 @@ async def update_task(
     if not session or not user_id:
         raise ValueError("Session and user_id are required")
     
-    # Find the task
-    stmt = select(Todo).where(Todo.id == UUID(task_id), Todo.user_id == UUID(user_id))
-    result = await session.execute(stmt)
-    todo = result.scalar_one_or_none()
-    
-    if not todo:
-        raise ValueError(f"Task with ID {task_id} not found or does not belong to user")
-    
-    # Update the task with provided values
+    # Update the task with provided values in a single UPDATE ... RETURNING
+    values = {}
     if title is not None:
-        todo.title = title
+        values["title"] = title
     if description is not None:
-        todo.description = description
+        values["description"] = description
     if completed is not None:
-        todo.completed = completed
+        values["completed"] = completed
+    
+    todo = await todo_repository.update_todo(session, UUID(task_id), UUID(user_id), values)
+    
+    if not todo:
+        raise ValueError(f"Task with ID {task_id} not found or does not belong to user")
     
-    await session.commit()
-    await session.refresh(todo)
+    await todo_repository.commit(session)
     
     return {
         "success": True,
@@ -52,4 +47,4 @@ async def update_task(
             "description": description,
             "completed": completed
         }
-    }
\ No newline at end of file
+    }
@@ -4,12 +4,9 @@ API router for authentication-related endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from core.security import verify_token
+from core.security import verify_token, get_current_user
 from jose import JWTError
 from typing import Optional
-from sqlmodel import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from database.session import get_async_session
 from models.user import User
 
 
@@ -19,48 +16,17 @@ security = HTTPBearer()
 
 @router.get("/me")
 async def get_current_user_info(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: AsyncSession = Depends(get_async_session)
+    current_user: User = Depends(get_current_user)
 ):
     """
     Get information about the current authenticated user
     """
-    token = credentials.credentials
-    
-    try:
-        payload = verify_token(token)
-        user_id = payload.get("sub")
-        
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Find user in database
-        statement = select(User).where(User.id == user_id)
-        result = await session.execute(statement)
-        user = result.scalar_one_or_none()
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        return {
-            "user_id": str(user.id),
-            "email": user.email,
-            "username": user.username,
-            "created_at": user.created_at
-        }
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return {
+        "user_id": str(current_user.id),
+        "email": current_user.email,
+        "username": current_user.username,
+        "created_at": current_user.created_at
+    }
 
 
 @router.get("/validate-token")
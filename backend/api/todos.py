@@ -2,26 +2,42 @@
 API router for todo-related endpoints with Dapr and Kafka integration
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlmodel import select
+from sqlalchemy import not_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Dict, List, Literal, Optional, Tuple
 from uuid import UUID
-from database.session import get_async_session
+from database.session import get_async_session, get_read_session, in_read_your_writes_window
+from database import todo_repository
 from models.todo import Todo, TodoCreate, TodoUpdate
 from models.user import User
+from models.todo_stats import UserTodoStats, UserTodoDailyStats
 from schemas.todo import (
     TodoCreateRequest,
     TodoUpdateRequest,
     TodoResponse,
     TodoListResponse,
     ApiResponse,
-    TodoToggleCompleteRequest
+    TodoToggleCompleteRequest,
+    TodoBatchOperation,
+    TodoBatchRequest,
+    TodoBulkCompleteRequest,
+    TodoBulkDeleteRequest,
+    TodoBatchResult,
+    TodoBatchResponse,
+    TodoDailyStats,
+    TodoStatsResponse
 )
 from core.security import get_current_user, verify_user_owns_resource
-from dapr.clients import DaprClient
-import json
-from datetime import datetime
+from core.config import settings
+from core.cache import todo_list_cache
+from core.outbox import outbox_relay
+from core.usage import fetch_aggregator
+from core.serialization import ModelResponse, dumps_str, loads
+import base64
+import binascii
+from datetime import datetime, timedelta
 import logging
 
 router = APIRouter()
@@ -29,28 +45,89 @@ router = APIRouter()
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Page size bounds for the todo list endpoint
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
-@router.get("/{user_id}/todos", response_model=TodoListResponse)
-async def get_user_todos(
-    user_id: UUID,
-    current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session)
-):
+
+def encode_cursor(todo: Todo) -> str:
     """
-    Get all todos for a specific user
+    Encode the keyset position (created_at, id) of a todo as an opaque cursor
     """
-    # Verify that the requesting user is the same as the user in the URL
-    if not verify_user_owns_resource(str(current_user.id), str(user_id)):
+    raw = dumps_str([todo.created_at.isoformat(), str(todo.id)])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode an opaque cursor back into its (created_at, id) keyset position
+    """
+    try:
+        created_at, todo_id = loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), UUID(todo_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeError):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this user's todos"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def check_batch_size(size: int):
+    """
+    Reject batches that are empty or larger than the configured maximum
+    """
+    if size == 0 or size > settings.todo_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch must contain between 1 and {settings.todo_batch_max_size} items"
         )
 
-    # Query todos for the user
+
+def batch_response(results: List[TodoBatchResult]) -> TodoBatchResponse:
+    """
+    Summarize per-item batch results
+    """
+    succeeded = sum(1 for result in results if result.status < 400)
+    return TodoBatchResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+
+
+async def load_todo_page(
+    session: AsyncSession,
+    user_id: UUID,
+    limit: int,
+    cursor: Optional[str],
+    completed: Optional[bool],
+    order: str
+) -> TodoListResponse:
+    """
+    Load one keyset page of a user's todos from the database
+    """
+    # Query one page of todos for the user, fetching one extra row to detect more pages
     statement = select(Todo).where(Todo.user_id == user_id)
+    if completed is not None:
+        statement = statement.where(Todo.completed == completed)
+
+    position = tuple_(Todo.created_at, Todo.id)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        if order == "desc":
+            statement = statement.where(position < tuple_(cursor_created_at, cursor_id))
+        else:
+            statement = statement.where(position > tuple_(cursor_created_at, cursor_id))
+
+    if order == "desc":
+        statement = statement.order_by(Todo.created_at.desc(), Todo.id.desc())
+    else:
+        statement = statement.order_by(Todo.created_at.asc(), Todo.id.asc())
+    statement = statement.limit(limit + 1)
+
     result = await session.execute(statement)
     todos = result.scalars().all()
 
+    has_more = len(todos) > limit
+    todos = todos[:limit]
+    next_cursor = encode_cursor(todos[-1]) if has_more else None
+
     todo_responses = [
         TodoResponse(
             id=todo.id,
@@ -63,26 +140,103 @@ async def get_user_todos(
         ) for todo in todos
     ]
 
-    # Publish event to Kafka via Dapr
-    try:
-        with DaprClient() as dapr_client:
-            event_data = {
-                "event_type": "user.todos.fetched",
-                "user_id": str(user_id),
-                "count": len(todo_responses),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            dapr_client.publish_event(
-                pubsub_name="pubsub",
-                topic_name="todo-events",
-                data=json.dumps(event_data),
-                data_content_type="application/json"
-            )
-    except Exception as e:
-        logger.error(f"Failed to publish event: {e}")
+    return TodoListResponse(
+        todos=todo_responses,
+        count=len(todo_responses),
+        next_cursor=next_cursor,
+        has_more=has_more
+    )
 
-    return TodoListResponse(todos=todo_responses, count=len(todo_responses))
+
+@router.get("/{user_id}/todos", response_model=TodoListResponse)
+async def get_user_todos(
+    user_id: UUID,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    completed: Optional[bool] = None,
+    order: Literal["asc", "desc"] = "asc",
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Get a page of todos for a specific user
+
+    Todos are ordered by (created_at, id) and paginated with a keyset cursor,
+    so each page costs one index range scan regardless of list size. Pass the
+    returned `next_cursor` back as `cursor` to fetch the following page.
+    """
+    # Verify that the requesting user is the same as the user in the URL
+    if not verify_user_owns_resource(str(current_user.id), str(user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this user's todos"
+        )
+
+    # Serve the page from the per-user cache, loading and caching it on a miss.
+    # Inside the read-your-writes window the cache is bypassed: another
+    # replica's invalidation may not have arrived yet.
+    cache_group = str(user_id)
+    cache_key = (cache_group, cursor, limit, completed, order)
+    use_cache = not in_read_your_writes_window(user_id)
+    cached = todo_list_cache.get(cache_key) if use_cache else None
+    if cached is not None:
+        count, body = cached
+    else:
+        cache_version = todo_list_cache.version(cache_group)
+        page = await load_todo_page(session, user_id, limit, cursor, completed, order)
+        count, body = page.count, page.model_dump_json().encode("utf-8")
+        if use_cache:
+            todo_list_cache.set(cache_key, (count, body), group=cache_group, version=cache_version)
+
+    # Count the fetch in memory; summaries are published periodically
+    fetch_aggregator.record(str(user_id), count)
+
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/{user_id}/todos/stats", response_model=TodoStatsResponse)
+async def get_todo_stats(
+    user_id: UUID,
+    days: int = Query(default=7, ge=1, le=90),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Get todo counters for a user, with per-day created/completed counts
+
+    Served from the statistics projection maintained by the todo event
+    consumer, so the cost does not grow with the number of todos. The
+    counters trail writes by the event pipeline's delivery lag.
+    """
+    # Verify that the requesting user is the same as the user in the URL
+    if not verify_user_owns_resource(str(current_user.id), str(user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this user's todos"
+        )
+
+    stats = await session.get(UserTodoStats, user_id)
+    total = stats.total if stats else 0
+    completed = stats.completed if stats else 0
+
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    statement = (
+        select(UserTodoDailyStats)
+        .where(UserTodoDailyStats.user_id == user_id, UserTodoDailyStats.day >= since)
+        .order_by(UserTodoDailyStats.day)
+    )
+    result = await session.execute(statement)
+
+    return ModelResponse(TodoStatsResponse(
+        user_id=user_id,
+        total=total,
+        completed=completed,
+        pending=total - completed,
+        daily=[
+            TodoDailyStats(day=row.day, created=row.created, completed=row.completed)
+            for row in result.scalars()
+        ]
+    ))
 
 
 @router.post("/{user_id}/todos", response_model=TodoResponse)
@@ -102,54 +256,17 @@ async def create_todo(
             detail="Not authorized to create todos for this user"
         )
 
-    # Create the new todo
-    todo = Todo(
+    # Create the new todo; its event is staged in the same transaction
+    todo = await todo_repository.create_todo(
+        session,
+        user_id=user_id,
         title=todo_data.title,
-        description=todo_data.description,
-        user_id=user_id
+        description=todo_data.description
     )
-
-    session.add(todo)
     await session.commit()
-    await session.refresh(todo)
-
-    # Publish event to Kafka via Dapr
-    try:
-        with DaprClient() as dapr_client:
-            event_data = {
-                "event_type": "todo.created",
-                "todo_id": str(todo.id),
-                "user_id": str(user_id),
-                "title": todo.title,
-                "description": todo.description,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            dapr_client.publish_event(
-                pubsub_name="pubsub",
-                topic_name="todo-events",
-                data=json.dumps(event_data),
-                data_content_type="application/json"
-            )
-            
-            # Also save to Dapr state store
-            dapr_client.save_state(
-                store_name="statestore",
-                key=f"todo-{todo.id}",
-                value=json.dumps({
-                    "id": str(todo.id),
-                    "title": todo.title,
-                    "description": todo.description,
-                    "completed": todo.completed,
-                    "user_id": str(todo.user_id),
-                    "created_at": todo.created_at.isoformat(),
-                    "updated_at": todo.updated_at.isoformat()
-                })
-            )
-    except Exception as e:
-        logger.error(f"Failed to publish event or save state: {e}")
+    outbox_relay.notify()
 
-    return TodoResponse(
+    return ModelResponse(TodoResponse(
         id=todo.id,
         title=todo.title,
         description=todo.description,
@@ -157,7 +274,7 @@ async def create_todo(
         user_id=todo.user_id,
         created_at=todo.created_at,
         updated_at=todo.updated_at
-    )
+    ))
 
 
 @router.get("/{user_id}/todos/{todo_id}", response_model=TodoResponse)
@@ -165,7 +282,7 @@ async def get_todo(
     user_id: UUID,
     todo_id: UUID,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Get a specific todo for a user
@@ -188,7 +305,7 @@ async def get_todo(
             detail="Todo not found"
         )
     
-    return TodoResponse(
+    return ModelResponse(TodoResponse(
         id=todo.id,
         title=todo.title,
         description=todo.description,
@@ -196,7 +313,7 @@ async def get_todo(
         user_id=todo.user_id,
         created_at=todo.created_at,
         updated_at=todo.updated_at
-    )
+    ))
 
 
 @router.put("/{user_id}/todos/{todo_id}", response_model=TodoResponse)
@@ -217,10 +334,14 @@ async def update_todo(
             detail="Not authorized to update this user's todos"
         )
 
-    # Query the specific todo
-    statement = select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id)
-    result = await session.execute(statement)
-    todo = result.scalar_one_or_none()
+    # Update the todo with provided data in a single UPDATE ... RETURNING
+    values = {}
+    if todo_data.title is not None:
+        values["title"] = todo_data.title
+    if todo_data.description is not None:
+        values["description"] = todo_data.description
+
+    todo = await todo_repository.update_todo(session, todo_id, user_id, values)
 
     if not todo:
         raise HTTPException(
@@ -228,59 +349,10 @@ async def update_todo(
             detail="Todo not found"
         )
 
-    # Store original data for event
-    original_title = todo.title
-    original_description = todo.description
-
-    # Update the todo with provided data
-    if todo_data.title is not None:
-        todo.title = todo_data.title
-    if todo_data.description is not None:
-        todo.description = todo_data.description
-
-    session.add(todo)
     await session.commit()
-    await session.refresh(todo)
-
-    # Publish event to Kafka via Dapr
-    try:
-        with DaprClient() as dapr_client:
-            event_data = {
-                "event_type": "todo.updated",
-                "todo_id": str(todo.id),
-                "user_id": str(user_id),
-                "original_title": original_title,
-                "original_description": original_description,
-                "updated_title": todo.title,
-                "updated_description": todo.description,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            dapr_client.publish_event(
-                pubsub_name="pubsub",
-                topic_name="todo-events",
-                data=json.dumps(event_data),
-                data_content_type="application/json"
-            )
-            
-            # Update in Dapr state store
-            dapr_client.save_state(
-                store_name="statestore",
-                key=f"todo-{todo.id}",
-                value=json.dumps({
-                    "id": str(todo.id),
-                    "title": todo.title,
-                    "description": todo.description,
-                    "completed": todo.completed,
-                    "user_id": str(todo.user_id),
-                    "created_at": todo.created_at.isoformat(),
-                    "updated_at": todo.updated_at.isoformat()
-                })
-            )
-    except Exception as e:
-        logger.error(f"Failed to publish event or update state: {e}")
+    outbox_relay.notify()
 
-    return TodoResponse(
+    return ModelResponse(TodoResponse(
         id=todo.id,
         title=todo.title,
         description=todo.description,
@@ -288,7 +360,7 @@ async def update_todo(
         user_id=todo.user_id,
         created_at=todo.created_at,
         updated_at=todo.updated_at
-    )
+    ))
 
 
 @router.delete("/{user_id}/todos/{todo_id}")
@@ -308,10 +380,8 @@ async def delete_todo(
             detail="Not authorized to delete this user's todos"
         )
 
-    # Query the specific todo
-    statement = select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id)
-    result = await session.execute(statement)
-    todo = result.scalar_one_or_none()
+    # Delete the todo in a single DELETE ... RETURNING
+    todo = await todo_repository.delete_todo(session, todo_id, user_id)
 
     if not todo:
         raise HTTPException(
@@ -319,45 +389,8 @@ async def delete_todo(
             detail="Todo not found"
         )
 
-    # Store todo data for event before deletion
-    todo_data = {
-        "id": str(todo.id),
-        "title": todo.title,
-        "description": todo.description,
-        "completed": todo.completed,
-        "user_id": str(todo.user_id),
-        "created_at": todo.created_at.isoformat(),
-        "updated_at": todo.updated_at.isoformat()
-    }
-
-    await session.delete(todo)
     await session.commit()
-
-    # Publish event to Kafka via Dapr
-    try:
-        with DaprClient() as dapr_client:
-            event_data = {
-                "event_type": "todo.deleted",
-                "todo_id": str(todo_id),
-                "user_id": str(user_id),
-                "todo_data": todo_data,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            dapr_client.publish_event(
-                pubsub_name="pubsub",
-                topic_name="todo-events",
-                data=json.dumps(event_data),
-                data_content_type="application/json"
-            )
-            
-            # Remove from Dapr state store
-            dapr_client.delete_state(
-                store_name="statestore",
-                key=f"todo-{todo_id}"
-            )
-    except Exception as e:
-        logger.error(f"Failed to publish event or delete state: {e}")
+    outbox_relay.notify()
 
     return {"success": True, "message": "Todo deleted successfully"}
 
@@ -380,10 +413,13 @@ async def toggle_todo_complete(
             detail="Not authorized to update this user's todos"
         )
 
-    # Query the specific todo
-    statement = select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id)
-    result = await session.execute(statement)
-    todo = result.scalar_one_or_none()
+    # Set or toggle the completion status in a single UPDATE ... RETURNING
+    if toggle_data.completed is not None:
+        completed = toggle_data.completed
+    else:
+        completed = not_(Todo.completed)  # Toggle if not specified
+
+    todo = await todo_repository.update_todo(session, todo_id, user_id, {"completed": completed})
 
     if not todo:
         raise HTTPException(
@@ -391,56 +427,10 @@ async def toggle_todo_complete(
             detail="Todo not found"
         )
 
-    # Store original completion status for event
-    original_completed = todo.completed
-
-    # Toggle the completion status
-    if toggle_data.completed is not None:
-        todo.completed = toggle_data.completed
-    else:
-        todo.completed = not todo.completed  # Toggle if not specified
-
-    session.add(todo)
     await session.commit()
-    await session.refresh(todo)
+    outbox_relay.notify()
 
-    # Publish event to Kafka via Dapr
-    try:
-        with DaprClient() as dapr_client:
-            event_data = {
-                "event_type": "todo.completed" if todo.completed else "todo.uncompleted",
-                "todo_id": str(todo_id),
-                "user_id": str(user_id),
-                "original_completed": original_completed,
-                "new_completed": todo.completed,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            dapr_client.publish_event(
-                pubsub_name="pubsub",
-                topic_name="todo-events",
-                data=json.dumps(event_data),
-                data_content_type="application/json"
-            )
-            
-            # Update in Dapr state store
-            dapr_client.save_state(
-                store_name="statestore",
-                key=f"todo-{todo.id}",
-                value=json.dumps({
-                    "id": str(todo.id),
-                    "title": todo.title,
-                    "description": todo.description,
-                    "completed": todo.completed,
-                    "user_id": str(todo.user_id),
-                    "created_at": todo.created_at.isoformat(),
-                    "updated_at": todo.updated_at.isoformat()
-                })
-            )
-    except Exception as e:
-        logger.error(f"Failed to publish event or update state: {e}")
-
-    return TodoResponse(
+    return ModelResponse(TodoResponse(
         id=todo.id,
         title=todo.title,
         description=todo.description,
@@ -448,4 +438,195 @@ async def toggle_todo_complete(
         user_id=todo.user_id,
         created_at=todo.created_at,
         updated_at=todo.updated_at
-    )
\ No newline at end of file
+    ))
+
+
+@router.post("/{user_id}/todos:batch", response_model=TodoBatchResponse)
+async def batch_todos(
+    user_id: UUID,
+    batch: TodoBatchRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Apply a batch of create, update, complete and delete operations for a user
+
+    Operations are grouped into one multi-row INSERT, UPDATE and DELETE and
+    committed in a single transaction. Each operation gets its own status:
+    201 created, 200 applied, 400 invalid, 404 not found, or 409 when the same
+    todo is targeted more than once in the batch.
+    """
+    # Verify that the requesting user is the same as the user in the URL
+    if not verify_user_owns_resource(str(current_user.id), str(user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this user's todos"
+        )
+
+    operations = batch.operations
+    check_batch_size(len(operations))
+
+    results: List[Optional[TodoBatchResult]] = [None] * len(operations)
+
+    def reject(index: int, operation: TodoBatchOperation, status_code: int, error: str):
+        results[index] = TodoBatchResult(
+            index=index,
+            op=operation.op,
+            status=status_code,
+            todo_id=operation.todo_id,
+            error=error
+        )
+
+    # Sort operations into one group per statement
+    creates: List[int] = []
+    changes: Dict[UUID, Dict] = {}
+    deletes: List[UUID] = []
+    index_by_id: Dict[UUID, int] = {}
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            if not operation.title:
+                reject(index, operation, status.HTTP_400_BAD_REQUEST, "title is required")
+            else:
+                creates.append(index)
+            continue
+
+        if operation.todo_id is None:
+            reject(index, operation, status.HTTP_400_BAD_REQUEST, "todo_id is required")
+            continue
+        if operation.todo_id in index_by_id:
+            reject(index, operation, status.HTTP_409_CONFLICT, "todo_id appears more than once in the batch")
+            continue
+        index_by_id[operation.todo_id] = index
+
+        if operation.op == "delete":
+            deletes.append(operation.todo_id)
+        elif operation.op == "complete":
+            changes[operation.todo_id] = {
+                "completed": True if operation.completed is None else operation.completed
+            }
+        else:
+            changes[operation.todo_id] = {
+                key: value for key, value in (
+                    ("title", operation.title),
+                    ("description", operation.description),
+                    ("completed", operation.completed)
+                ) if value is not None
+            }
+
+    created = await todo_repository.create_todos(
+        session,
+        user_id,
+        [{"title": operations[index].title, "description": operations[index].description} for index in creates]
+    )
+    updated = await todo_repository.update_todos(session, user_id, changes)
+    deleted = await todo_repository.delete_todos(session, user_id, deletes)
+
+    await session.commit()
+    outbox_relay.notify()
+
+    for index, todo in zip(creates, created):
+        results[index] = TodoBatchResult(
+            index=index,
+            op="create",
+            status=status.HTTP_201_CREATED,
+            todo_id=todo.id,
+            todo=TodoResponse.model_validate(todo, from_attributes=True)
+        )
+    for todo_id, index in index_by_id.items():
+        todo = updated.get(todo_id) or deleted.get(todo_id)
+        if todo is None:
+            reject(index, operations[index], status.HTTP_404_NOT_FOUND, "Todo not found")
+        else:
+            results[index] = TodoBatchResult(
+                index=index,
+                op=operations[index].op,
+                status=status.HTTP_200_OK,
+                todo_id=todo_id,
+                todo=TodoResponse.model_validate(todo, from_attributes=True)
+            )
+
+    return ModelResponse(batch_response(results))
+
+
+@router.patch("/{user_id}/todos:bulk-complete", response_model=TodoBatchResponse)
+async def bulk_complete_todos(
+    user_id: UUID,
+    bulk_data: TodoBulkCompleteRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Set the completion status of several todos in one UPDATE
+    """
+    # Verify that the requesting user is the same as the user in the URL
+    if not verify_user_owns_resource(str(current_user.id), str(user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this user's todos"
+        )
+
+    todo_ids = list(dict.fromkeys(bulk_data.todo_ids))
+    check_batch_size(len(todo_ids))
+
+    updated = await todo_repository.update_todos(
+        session,
+        user_id,
+        {todo_id: {"completed": bulk_data.completed} for todo_id in todo_ids}
+    )
+
+    await session.commit()
+    outbox_relay.notify()
+
+    return ModelResponse(batch_response([
+        TodoBatchResult(
+            index=index,
+            op="complete",
+            status=status.HTTP_200_OK,
+            todo_id=todo_id,
+            todo=TodoResponse.model_validate(updated[todo_id], from_attributes=True)
+        ) if todo_id in updated else TodoBatchResult(
+            index=index,
+            op="complete",
+            status=status.HTTP_404_NOT_FOUND,
+            todo_id=todo_id,
+            error="Todo not found"
+        )
+        for index, todo_id in enumerate(todo_ids)
+    ]))
+
+
+@router.post("/{user_id}/todos:bulk-delete", response_model=TodoBatchResponse)
+async def bulk_delete_todos(
+    user_id: UUID,
+    bulk_data: TodoBulkDeleteRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Delete several todos in one DELETE
+    """
+    # Verify that the requesting user is the same as the user in the URL
+    if not verify_user_owns_resource(str(current_user.id), str(user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to delete this user's todos"
+        )
+
+    todo_ids = list(dict.fromkeys(bulk_data.todo_ids))
+    check_batch_size(len(todo_ids))
+
+    deleted = await todo_repository.delete_todos(session, user_id, todo_ids)
+
+    await session.commit()
+    outbox_relay.notify()
+
+    return ModelResponse(batch_response([
+        TodoBatchResult(
+            index=index,
+            op="delete",
+            status=status.HTTP_200_OK if todo_id in deleted else status.HTTP_404_NOT_FOUND,
+            todo_id=todo_id,
+            error=None if todo_id in deleted else "Todo not found"
+        )
+        for index, todo_id in enumerate(todo_ids)
+    ]))
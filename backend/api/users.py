@@ -6,26 +6,39 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from passlib.context import CryptContext
 
 from database.session import get_async_session
 from models.user import User, UserCreate, UserPublic
 from core.security import create_access_token
 from core.config import settings
+from core.passwords import password_hasher, PasswordHasherBusy
 
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plaintext password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Generate a hash for the given password."""
-    return pwd_context.hash(password)
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
 
 
 @router.post("/register", response_model=UserPublic)
@@ -51,7 +64,7 @@ async def register_user(user_data: UserCreate, session: AsyncSession = Depends(g
         )
     
     # Hash the password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     
     # Create new user with hashed password
     user = User(
@@ -82,7 +95,7 @@ async def login_user(email: str, password: str, session: AsyncSession = Depends(
     result = await session.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -0,0 +1,159 @@
+"""
+In-process caching utilities for the Todo application
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+from core.config import settings
+from core.metrics import register_metrics
+import time
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after a fixed time-to-live
+
+    Entries can be tagged with a group so that every entry belonging to, for
+    example, one user can be invalidated at once. Readers that load a value
+    from the source should capture `version(group)` first and pass it to
+    `set`, so a value read before a concurrent invalidation is not cached
+    after it. The cache is meant to be used from a single event loop and is
+    not thread-safe.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Optional[Hashable]]]" = OrderedDict()
+        self._groups: Dict[Hashable, Set[Hashable]] = {}
+        self._versions: Dict[Hashable, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for key, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def version(self, group: Hashable) -> Tuple[int, int]:
+        """
+        Return a token that changes whenever group is invalidated
+        """
+        return (self._epoch, self._versions.get(group, 0))
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        group: Optional[Hashable] = None,
+        ttl: Optional[float] = None,
+        version: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Store a value, evicting the least recently used entries beyond maxsize
+
+        If version is given and group has been invalidated since it was
+        captured, the value is stale and is not stored.
+        """
+        if self.maxsize <= 0:
+            return
+        if version is not None and group is not None and version != self.version(group):
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value, group)
+        if group is not None:
+            self._groups.setdefault(group, set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """
+        Drop a single entry
+        """
+        if key in self._entries:
+            self._remove(key)
+            self.invalidations += 1
+
+    def invalidate_group(self, group: Hashable):
+        """
+        Drop every entry tagged with group
+        """
+        for key in list(self._groups.get(group, ())):
+            self._remove(key)
+            self.invalidations += 1
+
+        self._versions[group] = self._versions.get(group, 0) + 1
+        if len(self._versions) > self.maxsize:
+            # Bound the version table; a new epoch invalidates every captured token
+            self._versions.clear()
+            self._epoch += 1
+
+    def clear(self):
+        """
+        Drop all entries
+        """
+        self._entries.clear()
+        self._groups.clear()
+        self._versions.clear()
+        self._epoch += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss/eviction counters and current size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+    def _remove(self, key: Hashable):
+        _, _, group = self._entries.pop(key)
+        if group is not None:
+            keys = self._groups.get(group)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._groups[group]
+
+
+# Serialized todo list pages keyed by (user_id, page parameters) and grouped
+# by user_id, so any write to a user's todos drops all of their cached pages
+todo_list_cache = TTLCache(
+    maxsize=settings.todo_list_cache_size,
+    ttl=settings.todo_list_cache_ttl_seconds
+)
+register_metrics("todo_list_cache", todo_list_cache.stats)
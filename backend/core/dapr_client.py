@@ -0,0 +1,50 @@
+"""
+Shared Dapr client for the Todo application
+"""
+
+from typing import Optional, TYPE_CHECKING
+import logging
+
+if TYPE_CHECKING:
+    from dapr.aio.clients import DaprClient
+
+
+logger = logging.getLogger(__name__)
+
+# Application-lifetime async Dapr client. A single instance keeps one gRPC
+# channel to the sidecar open for every request instead of dialing per call.
+_dapr_client: Optional["DaprClient"] = None
+
+
+def init_dapr_client() -> Optional["DaprClient"]:
+    """
+    Create the shared async Dapr client, or leave it unset if Dapr is unavailable
+    """
+    global _dapr_client
+
+    try:
+        from dapr.aio.clients import DaprClient
+        _dapr_client = DaprClient()
+        logger.info("Dapr client initialized")
+    except Exception as e:
+        logger.warning(f"Dapr client not initialized: {e}")
+        _dapr_client = None
+    return _dapr_client
+
+
+async def close_dapr_client():
+    """
+    Close the shared Dapr client and its gRPC channel
+    """
+    global _dapr_client
+
+    if _dapr_client is not None:
+        await _dapr_client.close()
+        _dapr_client = None
+
+
+def get_dapr_client() -> Optional["DaprClient"]:
+    """
+    Dependency returning the shared Dapr client, or None when Dapr is not available
+    """
+    return _dapr_client
@@ -0,0 +1,118 @@
+"""
+Cross-replica invalidation of the todo list cache
+"""
+
+from typing import Iterable, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from core.cache import TTLCache, todo_list_cache
+from database.session import engine
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL notification channel naming the users whose todos changed
+TODO_CHANGES_CHANNEL = "todo_changes"
+
+# User ids per notification, keeping payloads well under PostgreSQL's 8000 byte limit
+_USERS_PER_NOTIFICATION = 100
+
+
+def notify_changed_users(session: Session, user_ids: Iterable[str]):
+    """
+    Send a notification naming the users, delivered when the transaction commits
+
+    Must run inside the transaction that changed the users' todos.
+    PostgreSQL drops the notification if the transaction rolls back. On
+    other databases this does nothing.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    users = sorted(user_ids)
+    for start in range(0, len(users), _USERS_PER_NOTIFICATION):
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": TODO_CHANGES_CHANNEL, "payload": ",".join(users[start:start + _USERS_PER_NOTIFICATION])}
+        )
+
+
+class CacheInvalidationListener:
+    """
+    Drops cached todo lists that other backend replicas changed
+
+    Each commit that changes a user's todos also notifies `channel`. Every
+    replica listens on one dedicated connection and invalidates the named
+    users' cached pages, so a write served by one replica is not hidden by
+    another replica's cache until its TTL runs out. Notifications sent
+    while the connection is down are lost, so the whole cache is cleared
+    each time the listener connects. Listening needs PostgreSQL; on other
+    databases the cache stays per-process.
+    """
+
+    def __init__(self, cache: TTLCache, channel: str = TODO_CHANGES_CHANNEL, reconnect_interval: float = 5.0):
+        self.cache = cache
+        self.channel = channel
+        self.reconnect_interval = reconnect_interval
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.received = 0
+
+    async def start(self):
+        """
+        Start listening in the background
+        """
+        if self._task is None and engine.dialect.name == "postgresql":
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop listening and release the connection
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await self._listen()
+            except Exception as e:
+                logger.warning(f"Todo cache invalidation listener disconnected: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.reconnect_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _listen(self):
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver_connection = raw.driver_connection
+            closed = asyncio.Event()
+            driver_connection.add_termination_listener(lambda _: closed.set())
+            await driver_connection.add_listener(self.channel, self._on_notification)
+            # Changes made while no listener was connected went unannounced
+            self.cache.clear()
+            try:
+                waiters = {asyncio.create_task(closed.wait()), asyncio.create_task(self._stopping.wait())}
+                _, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in pending:
+                    waiter.cancel()
+                if closed.is_set():
+                    logger.warning("Todo cache invalidation listener lost its connection, reconnecting")
+            finally:
+                if not driver_connection.is_closed():
+                    await driver_connection.remove_listener(self.channel, self._on_notification)
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str):
+        self.received += 1
+        for user_id in payload.split(","):
+            if user_id:
+                self.cache.invalidate_group(user_id)
+
+
+# Global cache invalidation listener instance
+cache_invalidation_listener = CacheInvalidationListener(todo_list_cache)
@@ -0,0 +1,56 @@
+"""
+Runtime metrics registry for the Todo application
+"""
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable
+
+
+# Named providers whose snapshots are served from the /metrics endpoint
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+class Histogram:
+    """
+    Cumulative histogram over fixed bucket upper bounds
+    """
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """
+        Record one observation
+        """
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the count, sum and cumulative count per upper bound
+        """
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self._counts):
+            cumulative += count
+            buckets[f"{bound:g}"] = cumulative
+        buckets["+Inf"] = self.count
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+def register_metrics(name: str, provider: Callable[[], Dict[str, Any]]):
+    """
+    Register a callable returning a snapshot of a component's metrics
+    """
+    _providers[name] = provider
+
+
+def collect_metrics() -> Dict[str, Any]:
+    """
+    Collect the current snapshot from every registered provider
+    """
+    return {name: provider() for name, provider in _providers.items()}
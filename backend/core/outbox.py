@@ -0,0 +1,282 @@
+"""
+Transactional outbox and background relay for todo events
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from sqlmodel import select
+from sqlalchemy import delete, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from core.dapr_client import get_dapr_client
+from database.session import engine
+from models.outbox import OutboxEvent
+from core.serialization import dumps_str
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL advisory lock held by the replica currently draining the outbox
+OUTBOX_LOCK_KEY = 0x6F7574626F78
+
+
+def enqueue_event(
+    session: AsyncSession,
+    event_data: Dict[str, Any],
+    state: Optional[Dict[str, Any]] = None
+) -> Optional[OutboxEvent]:
+    """
+    Stage an event in the outbox as part of the caller's transaction
+
+    The event is only visible to the relay once the caller commits, so it is
+    published if and only if the row change it describes was persisted.
+    `state` is the todo snapshot to write to the state store and the state
+    topic; omit it for deletes. Without a Dapr client nothing could ever
+    relay the event, so it is not staged and None is returned.
+    """
+    if get_dapr_client() is None:
+        return None
+
+    event = OutboxEvent(
+        topic=settings.todo_events_topic,
+        event_type=event_data["event_type"],
+        user_id=event_data["user_id"],
+        todo_id=event_data.get("todo_id"),
+        payload=dumps_str(event_data),
+        state=dumps_str(state) if state is not None else None
+    )
+    session.add(event)
+    return event
+
+
+def _is_unimplemented(error: Exception) -> bool:
+    """
+    Check whether a gRPC error means the sidecar does not implement the call
+    """
+    code = getattr(error, "code", None)
+    return callable(code) and getattr(code(), "name", None) == "UNIMPLEMENTED"
+
+
+class OutboxRelay:
+    """
+    Background task that drains the outbox to Dapr pub/sub in batches
+    """
+
+    def __init__(self, batch_size: int = 100, poll_interval: float = 1.0, warning_interval: float = 60.0):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        # Minimum seconds between warnings about events that cannot be relayed
+        self.warning_interval = warning_interval
+        self._last_warning: Optional[float] = None
+        self._bulk_publish_supported = True
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self):
+        """
+        Wake the relay after a commit so new events go out without waiting for the next poll
+        """
+        self._wakeup.set()
+
+    async def start(self):
+        """
+        Start draining the outbox in the background
+        """
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the relay after a final drain
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                drained = await self.drain_once()
+            except Exception as e:
+                logger.error(f"Failed to relay outbox events: {e}")
+                await self._warn_backlog("events are not being relayed")
+                drained = 0
+
+            # A full batch means more rows are probably waiting
+            if drained >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+        try:
+            await self.drain_once()
+        except Exception as e:
+            logger.error(f"Failed to relay outbox events on shutdown: {e}")
+
+    async def drain_once(self) -> int:
+        """
+        Publish and delete one batch of pending events, returning how many were relayed
+
+        Every replica runs a relay, but only one drains at a time: the
+        batch's transaction takes a PostgreSQL advisory lock and other
+        replicas skip their turn while it is held. Otherwise two relays
+        could publish consecutive batches at once and deliver one user's
+        events, or one todo's snapshots, out of order. A failure leaves the
+        batch in place to be retried, so consumers may see duplicates but
+        never miss an event.
+        """
+        dapr_client = get_dapr_client()
+        if dapr_client is None:
+            await self._warn_backlog("the Dapr client is not available")
+            return 0
+
+        async with AsyncSession(engine) as session:
+            if engine.dialect.name == "postgresql":
+                # Released when the transaction ends
+                acquired = (await session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": OUTBOX_LOCK_KEY}
+                )).scalar_one()
+                if not acquired:
+                    return 0
+
+            statement = (
+                select(OutboxEvent)
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update()
+            )
+            result = await session.execute(statement)
+            events = result.scalars().all()
+            if not events:
+                return 0
+
+            await self._publish(dapr_client, events)
+            latest = self._latest_states(events)
+            await self._publish_state(dapr_client, latest)
+            await self._apply_state(dapr_client, latest)
+
+            await session.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_([event.id for event in events]))
+            )
+            await session.commit()
+
+        return len(events)
+
+    async def _warn_backlog(self, reason: str):
+        """
+        Log the number of pending events, at most once per `warning_interval`
+        """
+        now = time.monotonic()
+        if self._last_warning is not None and now - self._last_warning < self.warning_interval:
+            return
+        self._last_warning = now
+
+        async with AsyncSession(engine) as session:
+            pending = (await session.execute(select(func.count()).select_from(OutboxEvent))).scalar_one()
+        if pending:
+            logger.warning(f"{pending} outbox events are waiting to be published: {reason}")
+
+    async def _publish(self, dapr_client, events: List[OutboxEvent]):
+        # Events are keyed by user so each user's events land on one partition
+        # in order. Bulk publish metadata applies to the whole request, so
+        # each (topic, user) group goes out as its own bulk publish.
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for event in events:
+            groups.setdefault((event.topic, event.user_id), []).append(event.payload)
+
+        for (topic, user_id), payloads in groups.items():
+            publish_metadata = {"partitionKey": user_id}
+
+            if self._bulk_publish_supported and len(payloads) > 1:
+                try:
+                    response = await dapr_client.publish_events(
+                        pubsub_name=settings.dapr_pubsub_name,
+                        topic_name=topic,
+                        data=payloads,
+                        data_content_type="application/json",
+                        publish_metadata=publish_metadata
+                    )
+                except Exception as e:
+                    if not _is_unimplemented(e):
+                        raise
+                    logger.warning(f"Bulk publish not supported by the sidecar, publishing one by one: {e}")
+                    self._bulk_publish_supported = False
+                else:
+                    if response.failed_entries:
+                        raise RuntimeError(
+                            f"{len(response.failed_entries)} of {len(payloads)} events failed to publish"
+                        )
+                    continue
+
+            for payload in payloads:
+                await dapr_client.publish_event(
+                    pubsub_name=settings.dapr_pubsub_name,
+                    topic_name=topic,
+                    data=payload,
+                    data_content_type="application/json",
+                    publish_metadata=publish_metadata
+                )
+
+    def _latest_states(self, events: List[OutboxEvent]) -> Dict[str, Optional[str]]:
+        """
+        Map each todo changed in the batch to its last snapshot, or None if it was deleted
+        """
+        # Only the last change to each todo needs to reach the state store and state topic
+        latest: Dict[str, Optional[str]] = {}
+        for event in events:
+            if event.todo_id is None:
+                continue
+            if event.state is not None:
+                latest[event.todo_id] = event.state
+            elif event.event_type == "todo.deleted":
+                latest[event.todo_id] = None
+        return latest
+
+    async def _publish_state(self, dapr_client, latest: Dict[str, Optional[str]]):
+        # Snapshots are keyed by todo id so compaction keeps only the latest one per
+        # todo. They go out raw, without the CloudEvents envelope, and a delete is
+        # an empty body that state readers treat as a tombstone.
+        await asyncio.gather(*(
+            dapr_client.publish_event(
+                pubsub_name=settings.dapr_pubsub_name,
+                topic_name=settings.todo_state_topic,
+                data=state if state is not None else "",
+                data_content_type="application/json",
+                publish_metadata={"partitionKey": todo_id, "rawPayload": "true"}
+            )
+            for todo_id, state in latest.items()
+        ))
+
+    async def _apply_state(self, dapr_client, latest: Dict[str, Optional[str]]):
+        saves = {f"todo-{todo_id}": value for todo_id, value in latest.items() if value is not None}
+        if saves:
+            from dapr.clients.grpc._state import StateItem
+            await dapr_client.save_bulk_state(
+                store_name=settings.dapr_state_store_name,
+                states=[StateItem(key=key, value=value) for key, value in saves.items()]
+            )
+
+        for todo_id, value in latest.items():
+            if value is None:
+                await dapr_client.delete_state(
+                    store_name=settings.dapr_state_store_name,
+                    key=f"todo-{todo_id}"
+                )
+
+
+# Global outbox relay instance
+outbox_relay = OutboxRelay(
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval_seconds,
+    warning_interval=settings.outbox_warning_interval_seconds
+)
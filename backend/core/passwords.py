@@ -0,0 +1,122 @@
+"""
+Password hashing for the Todo application
+
+bcrypt is deliberately slow, so hashing and verification run on a bounded
+thread pool instead of the event loop. bcrypt releases the GIL while it
+works, so the pool's threads hash in parallel and request handling on the
+loop carries on meanwhile.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from passlib.context import CryptContext
+from core.config import settings
+from core.metrics import register_metrics
+import asyncio
+import time
+
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when a hashing request waits longer than the queue timeout
+    """
+
+
+class PasswordHasher:
+    """
+    Runs password hashing on a bounded thread pool with admission control
+
+    At most `max_workers` hashes run at once. Callers beyond that wait for a
+    slot for at most `queue_timeout` seconds and then get PasswordHasherBusy,
+    so a login burst is shed instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, queue_timeout: float):
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max_workers)
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password
+        """
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a plaintext password against a hash
+        """
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PasswordHasherBusy(
+                f"No password hashing slot became free within {self.queue_timeout}s"
+            )
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - queued_at
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+        self.in_flight += 1
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher"
+                )
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def shutdown(self):
+        """
+        Stop the worker threads once running hashes finish
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pool size, queue depth and wait-time counters
+        """
+        admitted = self.completed + self.in_flight
+        return {
+            "max_workers": self.max_workers,
+            "queue_timeout_seconds": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds_avg": self.wait_seconds_total / admitted if admitted else 0.0,
+            "wait_seconds_max": self.wait_seconds_max
+        }
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    queue_timeout=settings.password_hash_queue_timeout_seconds
+)
+register_metrics("password_hasher", password_hasher.stats)
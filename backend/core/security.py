@@ -4,19 +4,65 @@ Security utilities for the Todo application
 
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+import time
 import jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .config import settings
+from .cache import TTLCache
+from .metrics import register_metrics
 from jose import JWTError
 from sqlmodel import select
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from database.session import get_async_session
 from models.user import User
 
 
 security = HTTPBearer()
 
+# Verified token payloads keyed by the raw token, never kept past the token's expiry
+token_cache = TTLCache(maxsize=settings.auth_cache_size, ttl=settings.auth_cache_ttl_seconds)
+# Detached copies of authenticated users keyed by user id
+user_cache = TTLCache(maxsize=settings.auth_cache_size, ttl=settings.auth_cache_ttl_seconds)
+register_metrics("auth_token_cache", token_cache.stats)
+register_metrics("auth_user_cache", user_cache.stats)
+
+# Session.info key collecting users changed in the open transaction
+CHANGED_USERS_KEY = "auth_changed_users"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target: User):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(CHANGED_USERS_KEY, set()).add(str(target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session):
+    # Savepoint releases fire after_commit too; wait for the real commit
+    if session.in_nested_transaction():
+        return
+    for user_id in session.info.pop(CHANGED_USERS_KEY, ()):
+        invalidate_cached_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop(CHANGED_USERS_KEY, None)
+
+
+def invalidate_cached_user(user_id: str):
+    """
+    Drop a user's cached row so the next request reloads it
+    """
+    user_cache.invalidate_group(str(user_id))
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
@@ -36,17 +82,30 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 def verify_token(token: str) -> Dict[str, Any]:
     """
     Verify the JWT token and return the payload
+
+    Verified payloads are cached until the earlier of the cache TTL and the
+    token's own expiry, so repeat requests skip signature verification.
     """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.better_auth_secret, algorithms=[settings.jwt_algorithm])
-        return payload
-    except JWTError:
+    except (JWTError, jwt.PyJWTError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    ttl = settings.auth_cache_ttl_seconds
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        token_cache.set(token, payload, ttl=ttl)
+    return payload
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -54,6 +113,9 @@ async def get_current_user(
 ) -> User:
     """
     Get the current user from the token
+
+    Users are served from a short-lived cache of detached copies, so most
+    authenticated requests do not query the users table.
     """
     token = credentials.credentials
     payload = verify_token(token)
@@ -66,7 +128,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    cached_user = user_cache.get(str(user_id))
+    if cached_user is not None:
+        return cached_user
+
     # Find user in database
+    cache_version = user_cache.version(str(user_id))
     statement = select(User).where(User.id == user_id)
     result = await session.execute(statement)
     user = result.scalar_one_or_none()
@@ -78,7 +145,16 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
+    # Cache a copy that is not bound to this request's session
+    cached_user = User(
+        id=user.id,
+        email=user.email,
+        username=user.username,
+        hashed_password=user.hashed_password,
+        created_at=user.created_at
+    )
+    user_cache.set(str(user_id), cached_user, group=str(user_id), version=cache_version)
+    return cached_user
 
 
 def verify_user_owns_resource(user_id_from_token: str, user_id_from_request: str) -> bool:
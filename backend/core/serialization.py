@@ -0,0 +1,81 @@
+"""
+JSON serialization for the Todo application
+
+API responses, MCP frames and event payloads all go through `dumps` and
+`loads`. orjson is used when it is installed and the standard library
+otherwise; both produce compact UTF-8 JSON.
+"""
+
+from typing import Any, Mapping, Optional, Union
+from datetime import date, datetime
+from uuid import UUID
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """
+    Convert values the JSON encoder does not handle natively
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize a value to JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(value: Any) -> str:
+    """
+    Serialize a value to a JSON string
+    """
+    return dumps(value).decode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON from a string or bytes; raises ValueError on invalid input
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class, rendering content with `dumps`
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(Response):
+    """
+    Response for a model the handler has already validated
+
+    FastAPI validates and re-serializes a handler's return value against its
+    `response_model`; returning this instead serializes the model once, so
+    endpoints can keep `response_model` for the schema without paying twice.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, model: BaseModel, status_code: int = 200, headers: Optional[Mapping[str, str]] = None):
+        super().__init__(content=model.model_dump_json(), status_code=status_code, headers=headers)
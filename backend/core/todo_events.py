@@ -0,0 +1,93 @@
+"""
+Todo event payloads for the Todo application
+"""
+
+from typing import Dict, Any
+from datetime import datetime
+from models.todo import Todo
+import uuid
+
+
+# Version of the event layout, kept in step with kafka/events/schema.py. Version 2
+# events are flat: todo_id, user_id and the changed fields sit at the top level.
+EVENT_SCHEMA_VERSION = 2
+
+
+def todo_snapshot(todo: Todo) -> Dict[str, Any]:
+    """
+    Serialize the current state of a todo
+    """
+    return {
+        "id": str(todo.id),
+        "title": todo.title,
+        "description": todo.description,
+        "completed": todo.completed,
+        "user_id": str(todo.user_id),
+        "created_at": todo.created_at.isoformat(),
+        "updated_at": todo.updated_at.isoformat()
+    }
+
+
+def todo_created_event(todo: Todo) -> Dict[str, Any]:
+    """
+    Build a todo.created event
+    """
+    return {
+        "event_type": "todo.created",
+        "event_id": str(uuid.uuid4()),
+        "schema_version": EVENT_SCHEMA_VERSION,
+        "todo_id": str(todo.id),
+        "user_id": str(todo.user_id),
+        "title": todo.title,
+        "description": todo.description,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def todo_updated_event(todo: Todo, original_title: str, original_description: str) -> Dict[str, Any]:
+    """
+    Build a todo.updated event
+    """
+    return {
+        "event_type": "todo.updated",
+        "event_id": str(uuid.uuid4()),
+        "schema_version": EVENT_SCHEMA_VERSION,
+        "todo_id": str(todo.id),
+        "user_id": str(todo.user_id),
+        "original_title": original_title,
+        "original_description": original_description,
+        "updated_title": todo.title,
+        "updated_description": todo.description,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def todo_completion_event(todo: Todo, original_completed: bool) -> Dict[str, Any]:
+    """
+    Build a todo.completed or todo.uncompleted event
+    """
+    return {
+        "event_type": "todo.completed" if todo.completed else "todo.uncompleted",
+        "event_id": str(uuid.uuid4()),
+        "schema_version": EVENT_SCHEMA_VERSION,
+        "todo_id": str(todo.id),
+        "user_id": str(todo.user_id),
+        "original_completed": original_completed,
+        "new_completed": todo.completed,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def todo_deleted_event(todo_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a todo.deleted event from the snapshot taken before deletion
+    """
+    return {
+        "event_type": "todo.deleted",
+        "event_id": str(uuid.uuid4()),
+        "schema_version": EVENT_SCHEMA_VERSION,
+        "todo_id": todo_data["id"],
+        "user_id": todo_data["user_id"],
+        "todo_data": todo_data,
+        "timestamp": datetime.utcnow().isoformat()
+    }
@@ -0,0 +1,143 @@
+"""
+In-process usage analytics for the Todo application
+"""
+
+from typing import Dict, Any, Optional
+from datetime import datetime
+from core.config import settings
+from core.dapr_client import get_dapr_client
+from core.metrics import register_metrics
+from core.todo_events import EVENT_SCHEMA_VERSION
+from core.serialization import dumps_str
+import asyncio
+import random
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FetchAggregator:
+    """
+    Counts todo list fetches per user and publishes them as periodic summaries
+
+    Recording a fetch only updates an in-memory counter, so reads cost no
+    pub/sub traffic. Every `flush_interval` seconds the counters are swapped
+    out and published as `user.todos.fetch_summary` events of at most
+    `max_users_per_event` users each. With a `sample_rate` below 1 only that
+    fraction of fetches is counted; summaries carry the rate so analytics
+    can scale the counts back up. Counts recorded since the last flush are
+    lost if the process dies.
+    """
+
+    def __init__(self, flush_interval: float = 60.0, sample_rate: float = 1.0, max_users_per_event: int = 1000):
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.max_users_per_event = max_users_per_event
+        # user_id -> {"fetches": ..., "last_count": ...}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._window_start = datetime.utcnow()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.dropped = 0
+
+    def record(self, user_id: str, count: int):
+        """
+        Count one fetch of a user's todo list that returned `count` todos
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        entry = self._counts.get(user_id)
+        if entry is None:
+            self._counts[user_id] = {"fetches": 1, "last_count": count}
+        else:
+            entry["fetches"] += 1
+            entry["last_count"] = count
+
+    async def start(self):
+        """
+        Start flushing summaries in the background
+        """
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background task after a final flush
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to publish fetch summaries: {e}")
+
+    async def flush(self):
+        """
+        Publish and reset the counters collected since the last flush
+        """
+        counts, self._counts = self._counts, {}
+        window_start, window_end = self._window_start, datetime.utcnow()
+        self._window_start = window_end
+        if not counts:
+            return
+
+        dapr_client = get_dapr_client()
+        if dapr_client is None:
+            self.dropped += len(counts)
+            return
+
+        users = list(counts.items())
+        for start in range(0, len(users), self.max_users_per_event):
+            event_data = self._summary_event(dict(users[start:start + self.max_users_per_event]), window_start, window_end)
+            await dapr_client.publish_event(
+                pubsub_name=settings.dapr_pubsub_name,
+                topic_name=settings.todo_events_topic,
+                data=dumps_str(event_data),
+                data_content_type="application/json"
+            )
+            self.published += 1
+
+    def _summary_event(self, users: Dict[str, Dict[str, int]], window_start: datetime, window_end: datetime) -> Dict[str, Any]:
+        return {
+            "event_type": "user.todos.fetch_summary",
+            "event_id": str(uuid.uuid4()),
+            "schema_version": EVENT_SCHEMA_VERSION,
+            "window_start": window_start.isoformat(),
+            "window_end": window_end.isoformat(),
+            "sample_rate": self.sample_rate,
+            "users": users,
+            "timestamp": window_end.isoformat()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the pending user count and how many summaries were published or dropped
+        """
+        return {
+            "pending_users": len(self._counts),
+            "published_events": self.published,
+            "dropped_users": self.dropped,
+            "sample_rate": self.sample_rate
+        }
+
+
+# Global fetch aggregator instance
+fetch_aggregator = FetchAggregator(
+    flush_interval=settings.fetch_summary_interval_seconds,
+    sample_rate=settings.fetch_summary_sample_rate,
+    max_users_per_event=settings.fetch_summary_max_users
+)
+register_metrics("fetch_aggregator", fetch_aggregator.stats)
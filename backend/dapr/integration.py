@@ -4,8 +4,10 @@ Dapr integration for the Todo application
 
 from dapr.clients import DaprClient
 from typing import Dict, Any, Optional
+from core.todo_events import EVENT_SCHEMA_VERSION
 import json
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -68,11 +70,16 @@ class DaprIntegration:
     def publish_todo_event(self, event_type: str, event_data: Dict[str, Any]) -> bool:
         """
         Publish a todo event to Dapr pub/sub
+
+        `event_data` holds the event's fields (todo_id, user_id and the
+        type-specific ones), which are published flat as a current-version event.
         """
         try:
             event_payload = {
                 "event_type": event_type,
-                "data": event_data,
+                "event_id": str(uuid.uuid4()),
+                "schema_version": EVENT_SCHEMA_VERSION,
+                **event_data,
                 "timestamp": self._get_timestamp()
             }
             
@@ -80,7 +87,9 @@ class DaprIntegration:
                 pubsub_name="pubsub",
                 topic_name="todo-events",
                 data=json.dumps(event_payload),
-                data_content_type="application/json"
+                data_content_type="application/json",
+                # Key by user so each user's events stay on one partition in order
+                publish_metadata={"partitionKey": str(event_data["user_id"])} if event_data.get("user_id") else {}
             )
             logger.info(f"Published event {event_type} to pub/sub")
             return True
@@ -0,0 +1,129 @@
+"""
+Connection pool and query instrumentation for the Todo application
+"""
+
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from core.metrics import Histogram, register_metrics
+import time
+
+
+# Bucket upper bounds in seconds and in statements per request
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Checkout wait per engine, keyed by the pool's logging name
+checkout_wait_seconds: Dict[str, Histogram] = {}
+request_sql_statements = Histogram(STATEMENT_BUCKETS)
+request_sql_seconds = Histogram(WAIT_BUCKETS)
+
+_engines: List[AsyncEngine] = []
+
+# Per-request statement counters shared with the query metrics middleware
+_request_queries: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_queries", default=None)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waits for a connection
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            name = self._orig_logging_name or "default"
+            histogram = checkout_wait_seconds.get(name)
+            if histogram is None:
+                histogram = checkout_wait_seconds[name] = Histogram(WAIT_BUCKETS)
+            histogram.observe(time.perf_counter() - started)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    queries = _request_queries.get()
+    if queries is not None:
+        queries["count"] += 1
+        queries["seconds"] += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine: AsyncEngine):
+    """
+    Track an engine's statements per request and report its pool in /metrics
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+    _engines.append(engine)
+
+
+def _pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.sync_engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "timeout_seconds": pool.timeout()
+        })
+    wait = checkout_wait_seconds.get(pool._orig_logging_name or "default")
+    if wait is not None:
+        stats["checkout_wait_seconds"] = wait.snapshot()
+    return stats
+
+
+def database_stats() -> Dict[str, Any]:
+    """
+    Return pool state per engine and per-request statement histograms
+    """
+    return {
+        "pools": {
+            engine.sync_engine.pool._orig_logging_name or "default": _pool_stats(engine)
+            for engine in _engines
+        },
+        "request_sql_statements": request_sql_statements.snapshot(),
+        "request_sql_seconds": request_sql_seconds.snapshot()
+    }
+
+
+async def query_metrics_middleware(request: Request, call_next):
+    """
+    Count and time the SQL statements each request runs
+
+    The totals feed the per-request histograms and are returned to the
+    client in a Server-Timing header.
+    """
+    queries = {"count": 0, "seconds": 0.0}
+    token = _request_queries.set(queries)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_queries.reset(token)
+
+    request_sql_statements.observe(queries["count"])
+    request_sql_seconds.observe(queries["seconds"])
+    response.headers["Server-Timing"] = (
+        f'db;dur={queries["seconds"] * 1000:.1f};desc="{queries["count"]} queries"'
+    )
+    return response
+
+
+register_metrics("database", database_stats)
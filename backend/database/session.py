@@ -2,26 +2,214 @@
 Database session setup for the Todo application
 """
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from typing import AsyncGenerator
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from itertools import cycle
+from typing import AsyncGenerator, Optional, Dict, Any
+import asyncio
+from uuid import UUID
+from fastapi import Request
 from core.config import settings
+from core.cache import TTLCache
+from database.metrics import InstrumentedPool, instrument_engine
 from sqlmodel import SQLModel
+import time
+
+
+# Response/request header carrying the time until which reads must use the primary
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle_seconds
+    )
+    instrument_engine(engine)
+    return engine
 
 
 # Create async engine with connection pooling
 # For Neon PostgreSQL, using standard asyncpg format
-engine = create_async_engine(
-    settings.database_url,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,
-    pool_recycle=300
-)
+engine = _create_engine(settings.database_url, "primary")
+
+# Read replicas, used round-robin for read-only queries
+replica_engines = [
+    _create_engine(url, f"replica-{index}")
+    for index, url in enumerate(settings.database_replica_urls)
+]
+_replica_cycle = cycle(replica_engines)
+
+# Users who wrote recently and must read from the primary until replicas catch up
+recent_writers = TTLCache(maxsize=100000, ttl=settings.read_your_writes_seconds)
+
+# Per-request stickiness state shared with the read-your-writes middleware
+_request_stickiness: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_stickiness", default=None)
+
+# Session.info key marking a session owned by a unit of work, which commits it once at the end
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+# Session shared by everything running inside the current unit of work
+_unit_of_work: ContextVar[Optional[AsyncSession]] = ContextVar("unit_of_work", default=None)
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Get an async database session
     """
-    async with AsyncSession(engine) as session:
-        yield session
\ No newline at end of file
+    # Objects stay loaded after commit, so handlers can serialize them
+    # without an extra SELECT to refresh expired attributes
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Run the enclosed work in one session and transaction, committed once at the end
+
+    Sessions opened with `write_session` or `read_session` inside the block
+    (including in tasks it starts) share this session, and their commits
+    only flush, so the whole block applies atomically and holds a single
+    pooled connection. Each joined session runs in a savepoint: if it exits
+    with an exception only its own changes are rolled back, and the rest of
+    the block can carry on and commit. An exception escaping the block rolls
+    everything back. Concurrent users of the shared session take turns. A
+    nested unit of work joins the enclosing one.
+    """
+    current = _unit_of_work.get()
+    if current is not None:
+        yield current
+        return
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.info[UNIT_OF_WORK_KEY] = asyncio.Lock()
+        token = _unit_of_work.set(session)
+        try:
+            yield session
+            await session.commit()
+        finally:
+            _unit_of_work.reset(token)
+
+
+@asynccontextmanager
+async def _shared_session(session: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
+    # An AsyncSession cannot run two operations at once
+    async with session.info[UNIT_OF_WORK_KEY]:
+        # A savepoint keeps one caller's failure from poisoning the shared transaction
+        async with session.begin_nested():
+            yield session
+
+
+@asynccontextmanager
+async def write_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open a session for writes, or join the current unit of work
+    """
+    shared = _unit_of_work.get()
+    if shared is not None:
+        async with _shared_session(shared) as session:
+            yield session
+        return
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+def mark_recent_write(user_id: UUID):
+    """
+    Pin a user's reads to the primary for the read-your-writes window
+    """
+    recent_writers.set(str(user_id), True)
+    stickiness = _request_stickiness.get()
+    if stickiness is not None:
+        stickiness["wrote"] = True
+
+
+def in_read_your_writes_window(user_id: UUID) -> bool:
+    """
+    Check whether a user's reads must see their latest writes
+
+    True while the user is inside the read-your-writes window, either
+    because they wrote through this process or because the request carries
+    a stickiness header from a write served elsewhere.
+    """
+    stickiness = _request_stickiness.get()
+    if stickiness is not None and stickiness["primary"]:
+        return True
+    return recent_writers.get(str(user_id)) is not None
+
+
+def read_engine_for(user_id: UUID) -> AsyncEngine:
+    """
+    Pick the engine for a user's read-only query
+
+    Reads go to the primary inside the read-your-writes window and to a
+    replica otherwise.
+    """
+    if not replica_engines or in_read_your_writes_window(user_id):
+        return engine
+    return next(_replica_cycle)
+
+
+@asynccontextmanager
+async def read_session(user_id: UUID) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open a session for a user's read-only queries
+
+    Inside a unit of work the reads use its session, so they see its
+    uncommitted writes.
+    """
+    shared = _unit_of_work.get()
+    if shared is not None:
+        async with _shared_session(shared) as session:
+            yield session
+        return
+
+    async with AsyncSession(read_engine_for(user_id), expire_on_commit=False) as session:
+        yield session
+
+
+async def get_read_session(user_id: UUID) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get an async database session for read-only endpoints, routed to a replica when safe
+    """
+    async with read_session(user_id) as session:
+        yield session
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """
+    Carry read-your-writes stickiness across requests and backend instances
+
+    A request that commits a write gets a header naming the time until which
+    the client's reads must use the primary; clients echo it back on
+    subsequent requests.
+    """
+    primary = False
+    sticky_until = request.headers.get(READ_PRIMARY_HEADER)
+    if sticky_until:
+        try:
+            primary = float(sticky_until) > time.time()
+        except ValueError:
+            pass
+
+    stickiness = {"primary": primary, "wrote": False}
+    token = _request_stickiness.set(stickiness)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_stickiness.reset(token)
+
+    if stickiness["wrote"]:
+        response.headers[READ_PRIMARY_HEADER] = f"{time.time() + settings.read_your_writes_seconds:.3f}"
+    elif primary:
+        response.headers[READ_PRIMARY_HEADER] = sticky_until
+    return response
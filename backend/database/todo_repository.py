@@ -0,0 +1,303 @@
+"""
+Data-access helpers for todo mutations
+
+Each helper performs the ownership check and the row change in a single
+statement and stages the matching outbox event in the caller's transaction.
+Callers own the transaction and commit once when they are done.
+"""
+
+from typing import Dict, Any, List, Optional
+from uuid import UUID
+from datetime import datetime
+from sqlmodel import select
+from sqlalchemy import update, delete, values as sql_values, column, cast, func, String, Boolean, Uuid
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models.todo import Todo
+from core.cache import todo_list_cache
+from database.session import mark_recent_write, UNIT_OF_WORK_KEY
+from core.outbox import enqueue_event, outbox_relay
+from core.invalidation import notify_changed_users
+from core.todo_events import (
+    todo_snapshot,
+    todo_created_event,
+    todo_updated_event,
+    todo_completion_event,
+    todo_deleted_event
+)
+
+
+# Session.info key collecting the users whose todos changed in the open transaction
+CHANGED_USERS_KEY = "todo_changed_users"
+
+
+def mark_user_changed(session: AsyncSession, user_id: UUID):
+    """
+    Record that a user's todos changed so their cached list is dropped on commit
+    """
+    session.info.setdefault(CHANGED_USERS_KEY, set()).add(str(user_id))
+
+
+@event.listens_for(Session, "before_commit")
+def _announce_changed_users(session: Session):
+    # Other replicas drop their cached pages once the notification commits
+    if session.in_nested_transaction():
+        return
+    changed_users = session.info.get(CHANGED_USERS_KEY)
+    if changed_users:
+        notify_changed_users(session, changed_users)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session):
+    # Invalidate only once the change is durable, so a concurrent read cannot
+    # re-cache the old rows after the invalidation. Releasing a savepoint also
+    # fires after_commit; the enclosing transaction may still roll back.
+    if session.in_nested_transaction():
+        return
+    changed_users = session.info.pop(CHANGED_USERS_KEY, ())
+    for user_id in changed_users:
+        todo_list_cache.invalidate_group(user_id)
+        mark_recent_write(user_id)
+    if changed_users and UNIT_OF_WORK_KEY in session.info:
+        # Units of work commit outside the callers that staged the events
+        outbox_relay.notify()
+
+
+async def commit(session: AsyncSession):
+    """
+    Commit the caller's changes and wake the outbox relay
+
+    A session owned by a unit of work is only flushed; the unit of work
+    commits it once when it ends.
+    """
+    if UNIT_OF_WORK_KEY in session.info:
+        await session.flush()
+        return
+    await session.commit()
+    outbox_relay.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session):
+    # A rolled back savepoint leaves the enclosing transaction's changes pending
+    if session.in_nested_transaction():
+        return
+    session.info.pop(CHANGED_USERS_KEY, None)
+
+
+async def create_todo(
+    session: AsyncSession,
+    user_id: UUID,
+    title: str,
+    description: Optional[str] = None
+) -> Todo:
+    """
+    Add a new todo for a user
+    """
+    todo = Todo(title=title, description=description, user_id=user_id)
+    session.add(todo)
+    mark_user_changed(session, user_id)
+    enqueue_event(session, todo_created_event(todo), state=todo_snapshot(todo))
+    return todo
+
+
+async def create_todos(
+    session: AsyncSession,
+    user_id: UUID,
+    items: List[Dict[str, Any]]
+) -> List[Todo]:
+    """
+    Add several todos for a user
+
+    Primary keys are generated client-side, so the rows go out as a single
+    multi-row INSERT when the caller flushes or commits.
+    """
+    return [
+        await create_todo(session, user_id, item["title"], item.get("description"))
+        for item in items
+    ]
+
+
+async def update_todo(
+    session: AsyncSession,
+    todo_id: UUID,
+    user_id: UUID,
+    values: Dict[str, Any]
+) -> Optional[Todo]:
+    """
+    Update a user's todo with UPDATE ... RETURNING in one round trip
+
+    `values` maps column names to new values or SQL expressions (for example
+    `not_(Todo.completed)` to toggle). The previous values are read from a
+    locked subquery in the same statement so the staged events can carry
+    them. Returns None when the todo does not exist or belongs to another user.
+    """
+    previous = (
+        select(Todo.id, Todo.title, Todo.description, Todo.completed)
+        .where(Todo.id == todo_id, Todo.user_id == user_id)
+        .with_for_update()
+        .subquery("previous")
+    )
+    statement = (
+        update(Todo)
+        .where(Todo.id == previous.c.id)
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(
+            Todo,
+            previous.c.title.label("previous_title"),
+            previous.c.description.label("previous_description"),
+            previous.c.completed.label("previous_completed")
+        )
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    result = await session.execute(statement)
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    todo = row.Todo
+    mark_user_changed(session, user_id)
+    if "title" in values or "description" in values:
+        enqueue_event(
+            session,
+            todo_updated_event(todo, row.previous_title, row.previous_description),
+            state=todo_snapshot(todo)
+        )
+    if "completed" in values:
+        enqueue_event(
+            session,
+            todo_completion_event(todo, row.previous_completed),
+            state=todo_snapshot(todo)
+        )
+    return todo
+
+
+async def update_todos(
+    session: AsyncSession,
+    user_id: UUID,
+    changes: Dict[UUID, Dict[str, Any]]
+) -> Dict[UUID, Todo]:
+    """
+    Apply per-todo changes for a user in one UPDATE ... FROM (VALUES ...) RETURNING
+
+    `changes` maps todo ids to the title, description and/or completed values
+    to set; missing keys leave the column unchanged. Returns the updated todos
+    keyed by id; ids that do not exist or belong to another user are absent.
+    """
+    if not changes:
+        return {}
+    mark_user_changed(session, user_id)
+
+    changed = sql_values(
+        column("id", Uuid),
+        column("title", String),
+        column("description", String),
+        column("completed", Boolean),
+        name="changes"
+    ).data([
+        (todo_id, change.get("title"), change.get("description"), change.get("completed"))
+        for todo_id, change in changes.items()
+    ])
+    previous = (
+        select(Todo.id, Todo.title, Todo.description, Todo.completed)
+        .where(Todo.user_id == user_id, Todo.id.in_(list(changes)))
+        .with_for_update()
+        .subquery("previous")
+    )
+    # All-NULL VALUES columns are typed as text, hence the casts
+    statement = (
+        update(Todo)
+        .where(Todo.id == previous.c.id, Todo.id == changed.c.id)
+        .values(
+            title=func.coalesce(cast(changed.c.title, String), Todo.title),
+            description=func.coalesce(cast(changed.c.description, String), Todo.description),
+            completed=func.coalesce(cast(changed.c.completed, Boolean), Todo.completed),
+            updated_at=datetime.utcnow()
+        )
+        .returning(
+            Todo,
+            previous.c.title.label("previous_title"),
+            previous.c.description.label("previous_description"),
+            previous.c.completed.label("previous_completed")
+        )
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    result = await session.execute(statement)
+
+    updated = {}
+    for row in result:
+        todo = row.Todo
+        change = changes[todo.id]
+        if change.get("title") is not None or change.get("description") is not None:
+            enqueue_event(
+                session,
+                todo_updated_event(todo, row.previous_title, row.previous_description),
+                state=todo_snapshot(todo)
+            )
+        if change.get("completed") is not None:
+            enqueue_event(
+                session,
+                todo_completion_event(todo, row.previous_completed),
+                state=todo_snapshot(todo)
+            )
+        updated[todo.id] = todo
+    return updated
+
+
+async def delete_todo(
+    session: AsyncSession,
+    todo_id: UUID,
+    user_id: UUID
+) -> Optional[Todo]:
+    """
+    Delete a user's todo with DELETE ... RETURNING in one round trip
+
+    Returns the deleted row, or None when the todo does not exist or belongs
+    to another user.
+    """
+    statement = (
+        delete(Todo)
+        .where(Todo.id == todo_id, Todo.user_id == user_id)
+        .returning(Todo)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(statement)
+    todo = result.scalar_one_or_none()
+    if todo is None:
+        return None
+
+    mark_user_changed(session, user_id)
+    enqueue_event(session, todo_deleted_event(todo_snapshot(todo)))
+    return todo
+
+
+async def delete_todos(
+    session: AsyncSession,
+    user_id: UUID,
+    todo_ids: List[UUID]
+) -> Dict[UUID, Todo]:
+    """
+    Delete several of a user's todos in one DELETE ... RETURNING
+
+    Returns the deleted rows keyed by id; ids that do not exist or belong to
+    another user are absent.
+    """
+    if not todo_ids:
+        return {}
+    mark_user_changed(session, user_id)
+
+    statement = (
+        delete(Todo)
+        .where(Todo.user_id == user_id, Todo.id.in_(todo_ids))
+        .returning(Todo)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(statement)
+
+    deleted = {}
+    for todo in result.scalars():
+        enqueue_event(session, todo_deleted_event(todo_snapshot(todo)))
+        deleted[todo.id] = todo
+    return deleted
@@ -3,9 +3,11 @@ Kafka producer for todo events using Dapr
 """
 
 import json
+import uuid
 from datetime import datetime
 from typing import Dict, Any
 from dapr.clients import DaprClient
+from core.todo_events import EVENT_SCHEMA_VERSION
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,7 +30,12 @@ class TodoEventProducer:
         try:
             event_data = {
                 "event_type": "todo.created",
-                "data": todo_data,
+                "event_id": str(uuid.uuid4()),
+                "schema_version": EVENT_SCHEMA_VERSION,
+                "todo_id": todo_data.get("id"),
+                "user_id": todo_data.get("user_id"),
+                "title": todo_data.get("title"),
+                "description": todo_data.get("description"),
                 "timestamp": datetime.utcnow().isoformat()
             }
             
@@ -37,7 +44,8 @@ class TodoEventProducer:
                     pubsub_name="pubsub",
                     topic_name="todo-events",
                     data=json.dumps(event_data),
-                    data_content_type="application/json"
+                    data_content_type="application/json",
+                    publish_metadata=self._partition_metadata(todo_data.get("user_id"))
                 )
             
             logger.info(f"Published todo.created event for todo {todo_data.get('id')}")
@@ -53,12 +61,12 @@ class TodoEventProducer:
         try:
             event_data = {
                 "event_type": "todo.updated",
-                "data": {
-                    "todo_id": todo_id,
-                    "user_id": user_id,
-                    "updates": updates,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
+                "event_id": str(uuid.uuid4()),
+                "schema_version": EVENT_SCHEMA_VERSION,
+                "todo_id": todo_id,
+                "user_id": user_id,
+                **{f"updated_{field}": updates[field] for field in ("title", "description") if field in updates},
+                "timestamp": datetime.utcnow().isoformat()
             }
             
             with DaprClient() as client:
@@ -66,7 +74,8 @@ class TodoEventProducer:
                     pubsub_name="pubsub",
                     topic_name="todo-events",
                     data=json.dumps(event_data),
-                    data_content_type="application/json"
+                    data_content_type="application/json",
+                    publish_metadata=self._partition_metadata(user_id)
                 )
             
             logger.info(f"Published todo.updated event for todo {todo_id}")
@@ -82,11 +91,11 @@ class TodoEventProducer:
         try:
             event_data = {
                 "event_type": "todo.deleted",
-                "data": {
-                    "todo_id": todo_id,
-                    "user_id": user_id,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
+                "event_id": str(uuid.uuid4()),
+                "schema_version": EVENT_SCHEMA_VERSION,
+                "todo_id": todo_id,
+                "user_id": user_id,
+                "timestamp": datetime.utcnow().isoformat()
             }
             
             with DaprClient() as client:
@@ -94,7 +103,8 @@ class TodoEventProducer:
                     pubsub_name="pubsub",
                     topic_name="todo-events",
                     data=json.dumps(event_data),
-                    data_content_type="application/json"
+                    data_content_type="application/json",
+                    publish_metadata=self._partition_metadata(user_id)
                 )
             
             logger.info(f"Published todo.deleted event for todo {todo_id}")
@@ -110,12 +120,12 @@ class TodoEventProducer:
         try:
             event_data = {
                 "event_type": "todo.completed" if completed else "todo.uncompleted",
-                "data": {
-                    "todo_id": todo_id,
-                    "user_id": user_id,
-                    "completed": completed,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
+                "event_id": str(uuid.uuid4()),
+                "schema_version": EVENT_SCHEMA_VERSION,
+                "todo_id": todo_id,
+                "user_id": user_id,
+                "new_completed": completed,
+                "timestamp": datetime.utcnow().isoformat()
             }
             
             with DaprClient() as client:
@@ -123,11 +133,18 @@ class TodoEventProducer:
                     pubsub_name="pubsub",
                     topic_name="todo-events",
                     data=json.dumps(event_data),
-                    data_content_type="application/json"
+                    data_content_type="application/json",
+                    publish_metadata=self._partition_metadata(user_id)
                 )
             
             logger.info(f"Published todo.completed event for todo {todo_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to publish todo.completed event: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def _partition_metadata(self, user_id: Any) -> Dict[str, str]:
+        """
+        Key events by user so each user's events stay on one partition in order
+        """
+        return {"partitionKey": str(user_id)} if user_id is not None else {}
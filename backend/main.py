@@ -2,7 +2,7 @@
 Main FastAPI application for the Todo application with Dapr integration
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from core.config import settings
@@ -10,15 +10,21 @@ from api.todos import router as todos_router
 from api.auth import router as auth_router
 from api.users import router as users_router
 from api.chat import router as chat_router
-from database.session import engine
-from models.todo import Todo
-from models.user import User
+from core.dapr_client import init_dapr_client, close_dapr_client, get_dapr_client
+from core.outbox import outbox_relay
+from core.invalidation import cache_invalidation_listener
+from core.usage import fetch_aggregator
+from core.passwords import password_hasher
+from core.metrics import collect_metrics
+from core.serialization import FastJSONResponse
+from database.session import engine, read_your_writes_middleware, READ_PRIMARY_HEADER
+from database.metrics import query_metrics_middleware
+# Imported so their tables are registered with SQLModel.metadata
+from models.todo import Todo  # noqa: F401
+from models.user import User  # noqa: F401
+from models.outbox import OutboxEvent  # noqa: F401
+from models.todo_stats import UserTodoStats, UserTodoDailyStats  # noqa: F401
 from sqlmodel import SQLModel
-# from dapr.clients import DaprClient
-
-
-# Global Dapr client instance
-dapr_client = None
 
 
 @asynccontextmanager
@@ -26,35 +32,39 @@ async def lifespan(app: FastAPI):
     """
     Lifespan event handler for the application
     """
-    global dapr_client
-    
-    # Initialize Dapr client (Optional)
-    try:
-        from dapr.clients import DaprClient
-        print("Initializing Dapr client...")
-        dapr_client = DaprClient()
-    except (ImportError, Exception) as e:
-        print(f"Dapr client not initialized: {e}")
-        dapr_client = None
+    # Initialize the shared Dapr client (Optional)
+    print("Initializing Dapr client...")
+    init_dapr_client()
     
     # Create tables on startup
     print("Creating database tables...")
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
     print("Database tables created successfully!")
+
+    # Relay outbox events to pub/sub in the background
+    await outbox_relay.start()
+    # Drop cached todo lists when other replicas change them
+    await cache_invalidation_listener.start()
+    # Publish todo list fetch summaries in the background
+    await fetch_aggregator.start()
     yield
     
     # Cleanup on shutdown
     print("Shutting down...")
-    if dapr_client:
-        dapr_client.close()
+    await fetch_aggregator.stop()
+    await cache_invalidation_listener.stop()
+    await outbox_relay.stop()
+    await close_dapr_client()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
     title=settings.app_name,
     version="1.0.0",
     description="Todo Application API - Phase III",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -64,8 +74,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_PRIMARY_HEADER],
 )
 
+# Keep a client's reads on the primary for a short while after it writes
+app.middleware("http")(read_your_writes_middleware)
+
+# Count and time the SQL statements run by each request
+app.middleware("http")(query_metrics_middleware)
+
 # Include routers
 app.include_router(users_router, prefix="/api/v1", tags=["users"])
 app.include_router(todos_router, prefix="/api/v1", tags=["todos"])
@@ -81,22 +98,17 @@ async def root():
 @app.get("/health")
 async def health_check():
     health_status = {"status": "healthy", "service": "todo-backend"}
-    if dapr_client:
+    if get_dapr_client():
         health_status["dapr"] = "connected"
     else:
         health_status["dapr"] = "not_available"
     return health_status
 
 
-# Function to get Dapr client (for dependency injection)
-def get_dapr_client():
-    global dapr_client
-    if dapr_client is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Dapr client not initialized"
-        )
-    return dapr_client
+# Runtime metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    return collect_metrics()
 
 
 def dev():
@@ -2,10 +2,17 @@
 MCP (Model Context Protocol) server for the Todo application
 """
 
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, List, Optional, Set, Union
+from contextlib import nullcontext
+import asyncio
+import logging
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
+from core.config import settings
+from core.serialization import dumps_str, loads
+from database.session import unit_of_work
+
+logger = logging.getLogger(__name__)
 
 
 class MCPTask(BaseModel):
@@ -15,16 +22,27 @@ class MCPTask(BaseModel):
     id: str
 
 
-class MCPResult(BaseModel):
-    """Base class for MCP results"""
-    result: Dict[str, Any]
-    id: str
+# Responses are plain dicts serialized once per frame, with no model validation
+MCPReply = Dict[str, Any]
 
 
-class MCPError(BaseModel):
-    """Base class for MCP errors"""
-    error: Dict[str, Any]
-    id: str
+def _result(result: Dict[str, Any], req_id: Any) -> MCPReply:
+    """Build a success response"""
+    return {"result": result, "id": req_id}
+
+
+def _error(code: int, message: str, req_id: Any = '') -> MCPReply:
+    """Build an error response"""
+    return {"error": {"code": code, "message": message}, "id": req_id}
+
+
+class MCPRequestError(Exception):
+    """A request failure carrying its JSON-RPC error code"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
 
 
 class MCPServer:
@@ -32,9 +50,12 @@ class MCPServer:
     Model Context Protocol server implementation
     """
     
-    def __init__(self):
+    def __init__(self, max_in_flight: int = 16, max_batch_size: int = 100):
         self.tools = {}
         self.sessions = {}
+        # Requests a single connection may have running at once
+        self.max_in_flight = max_in_flight
+        self.max_batch_size = max_batch_size
     
     def register_tool(self, name: str, handler):
         """
@@ -59,52 +80,167 @@ class MCPServer:
         return [{"name": name, "description": getattr(handler, '__doc__', '')} 
                 for name, handler in self.tools.items()]
     
+    async def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one request object and return its result, raising MCPRequestError on failure
+        """
+        method = request.get('method')
+        params = request.get('params') or {}
+
+        if method == 'tools/list':
+            # Return available tools
+            return {"tools": self.get_available_tools()}
+        elif isinstance(method, str) and method.startswith('call/'):
+            # Execute a tool
+            tool_name = method.split('/', 1)[1]
+            try:
+                return await self.execute_tool(tool_name, params)
+            except Exception as e:
+                raise MCPRequestError(-32603, str(e)) from e
+        raise MCPRequestError(-32601, f"Method {method} not found")
+
+    async def handle_request(self, request: Dict[str, Any], calls: Optional[asyncio.Semaphore] = None) -> MCPReply:
+        """
+        Run one request object and build its response
+
+        With `calls`, the request waits for a slot before it runs.
+        """
+        req_id = request.get('id', '')
+        try:
+            async with calls or nullcontext():
+                return _result(await self._dispatch(request), req_id)
+        except MCPRequestError as e:
+            return _error(e.code, e.message, req_id)
+
+    async def handle_batch(self, requests: List[Any], calls: Optional[asyncio.Semaphore] = None) -> List[MCPReply]:
+        """
+        Run a JSON-RPC batch and build one response per request
+
+        Requests run concurrently and each succeeds or fails on its own;
+        entries that are not request objects get an error in their place.
+        With `calls`, each request holds a slot while it runs, so a batch
+        counts towards the same limit as single requests. If any request
+        is marked `"transactional": true` the batch is applied atomically
+        instead: its requests run in order in one unit of work, holding a
+        single slot, and if one fails nothing is committed and every
+        request gets an error.
+        """
+        if len(requests) > self.max_batch_size:
+            return [_error(-32600, f"Batch must contain at most {self.max_batch_size} requests")]
+
+        if any(isinstance(request, dict) and request.get('transactional') for request in requests):
+            if not all(isinstance(request, dict) for request in requests):
+                # An atomic batch with an invalid entry is rejected without running anything
+                return [
+                    _error(-32000, "Batch rolled back: Invalid request", request.get('id', '')) if isinstance(request, dict)
+                    else _error(-32600, "Invalid request")
+                    for request in requests
+                ]
+            async with calls or nullcontext():
+                return await self._handle_transaction(requests)
+
+        async def respond(request: Any) -> MCPReply:
+            if not isinstance(request, dict):
+                return _error(-32600, "Invalid request")
+            return await self.handle_request(request, calls)
+
+        return list(await asyncio.gather(*(respond(request) for request in requests)))
+
+    async def _handle_transaction(self, requests: List[Dict[str, Any]]) -> List[MCPReply]:
+        """
+        Run a batch's requests in order in one unit of work, all or nothing
+        """
+        results = []
+        try:
+            async with unit_of_work():
+                for request in requests:
+                    results.append(await self._dispatch(request))
+        except Exception as e:
+            error = e if isinstance(e, MCPRequestError) else MCPRequestError(-32603, str(e))
+            failed = len(results)
+            return [
+                _error(error.code, error.message, request.get('id', '')) if index == failed
+                else _error(-32000, f"Batch rolled back: {error.message}", request.get('id', ''))
+                for index, request in enumerate(requests)
+            ]
+
+        return [
+            _result(result, request.get('id', ''))
+            for request, result in zip(requests, results)
+        ]
+
+    async def _handle_frame(self, data: str, send, calls: Optional[asyncio.Semaphore] = None):
+        """
+        Parse one frame, run its request or batch and send the response
+        """
+        try:
+            request = loads(data)
+        except ValueError as e:
+            response = _error(-32700, f"Parse error: {e}")
+        else:
+            if isinstance(request, list) and request:
+                response = await self.handle_batch(request, calls)
+            elif isinstance(request, dict):
+                response = await self.handle_request(request, calls)
+            else:
+                response = _error(-32600, "Invalid request")
+
+        try:
+            await send(response)
+        except Exception as e:
+            logger.warning(f"Failed to send MCP response: {e}")
+
     async def handle_websocket(self, websocket: WebSocket):
         """
         Handle incoming WebSocket connection for MCP
+
+        A frame holds one request object or a JSON-RPC batch array. Each
+        frame is run as its own task, so a slow tool call does not hold
+        up the requests behind it. Responses are sent as soon as they are
+        ready, possibly out of order; clients match them by `id`. At most
+        `max_in_flight` requests run at once per connection, counting each
+        request of a batch, so a connection never needs more database
+        sessions than that. At most `max_in_flight` frames are accepted at
+        once; beyond that the server stops reading frames until one finishes.
         """
         await websocket.accept()
         client_id = str(id(websocket))
         self.sessions[client_id] = websocket
-        
+
+        # Responses from concurrent requests must not interleave on the socket
+        send_lock = asyncio.Lock()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        calls = asyncio.Semaphore(self.max_in_flight)
+        in_flight: Set[asyncio.Task] = set()
+
+        async def send(response: Union[MCPReply, List[MCPReply]]):
+            text = dumps_str(response)
+            async with send_lock:
+                await websocket.send_text(text)
+
+        def finished(task: asyncio.Task):
+            in_flight.discard(task)
+            slots.release()
+
         try:
             while True:
                 data = await websocket.receive_text()
-                request = json.loads(data)
-                
-                method = request.get('method')
-                params = request.get('params', {})
-                req_id = request.get('id', '')
-                
-                if method == 'tools/list':
-                    # Return available tools
-                    tools = self.get_available_tools()
-                    response = MCPResult(result={"tools": tools}, id=req_id)
-                    await websocket.send_text(response.model_dump_json())
-                elif method.startswith('call/'):
-                    # Execute a tool
-                    tool_name = method.split('/', 1)[1]
-                    try:
-                        result = await self.execute_tool(tool_name, params)
-                        response = MCPResult(result=result, id=req_id)
-                        await websocket.send_text(response.model_dump_json())
-                    except Exception as e:
-                        error_response = MCPError(
-                            error={"code": -32603, "message": str(e)}, 
-                            id=req_id
-                        )
-                        await websocket.send_text(error_response.model_dump_json())
-                else:
-                    error_response = MCPError(
-                        error={"code": -32601, "message": f"Method {method} not found"}, 
-                        id=req_id
-                    )
-                    await websocket.send_text(error_response.model_dump_json())
-                    
+                await slots.acquire()
+                task = asyncio.create_task(self._handle_frame(data, send, calls))
+                in_flight.add(task)
+                task.add_done_callback(finished)
         except WebSocketDisconnect:
-            if client_id in self.sessions:
-                del self.sessions[client_id]
+            pass
+        finally:
+            # Nobody is left to receive the responses of unfinished requests
+            for task in list(in_flight):
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            self.sessions.pop(client_id, None)
 
 
 # Global MCP server instance
-mcp_server = MCPServer()
\ No newline at end of file
+mcp_server = MCPServer(
+    max_in_flight=settings.mcp_max_in_flight,
+    max_batch_size=settings.mcp_max_batch_size
+)
\ No newline at end of file
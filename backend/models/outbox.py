@@ -0,0 +1,28 @@
+"""
+Transactional outbox model for the Todo application
+"""
+
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class OutboxEvent(SQLModel, table=True):
+    """
+    An event staged in the same transaction as the row change it describes.
+
+    The outbox relay publishes pending rows to pub/sub in id order and deletes
+    them once the broker has accepted them, giving at-least-once delivery.
+    """
+    __tablename__ = "outbox_events"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    topic: str = Field(max_length=255)
+    event_type: str = Field(max_length=64)
+    user_id: str = Field(max_length=36)
+    todo_id: Optional[str] = Field(default=None, max_length=36)
+    # Serialized event body published to the topic
+    payload: str
+    # Serialized todo snapshot written to the state store and state topic; None for deletes
+    state: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -3,6 +3,7 @@ Database models for the Todo application
 """
 
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 import uuid
@@ -19,6 +20,10 @@ class TodoBase(SQLModel):
 
 class Todo(TodoBase, table=True):
     __tablename__ = "todos"
+    # Backs keyset pagination of a user's list on (created_at, id)
+    __table_args__ = (
+        Index("ix_todos_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="users.id")
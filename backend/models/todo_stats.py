@@ -0,0 +1,34 @@
+"""
+Per-user todo statistics read model for the Todo application
+"""
+
+from sqlmodel import SQLModel, Field
+from datetime import date, datetime
+import uuid
+
+
+class UserTodoStats(SQLModel, table=True):
+    """
+    Running todo counters for one user.
+
+    Maintained by the todo event consumer's statistics projection, not by
+    the API, so the stats endpoint never has to scan the todos table.
+    """
+    __tablename__ = "user_todo_stats"
+
+    user_id: uuid.UUID = Field(primary_key=True)
+    total: int = Field(default=0)
+    completed: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class UserTodoDailyStats(SQLModel, table=True):
+    """
+    Todos created and completed by one user on one (UTC) day.
+    """
+    __tablename__ = "user_todo_daily_stats"
+
+    user_id: uuid.UUID = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    created: int = Field(default=0)
+    completed: int = Field(default=0)
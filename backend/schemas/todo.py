@@ -3,8 +3,8 @@ API request/response schemas for the Todo application
 """
 
 from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from typing import Literal, Optional
+from datetime import date, datetime
 import uuid
 
 
@@ -35,6 +35,58 @@ class TodoResponse(BaseModel):
 class TodoListResponse(BaseModel):
     todos: list[TodoResponse]
     count: int
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class TodoDailyStats(BaseModel):
+    day: date
+    created: int
+    completed: int
+
+
+class TodoStatsResponse(BaseModel):
+    user_id: uuid.UUID
+    total: int
+    completed: int
+    pending: int
+    daily: list[TodoDailyStats]
+
+
+class TodoBatchOperation(BaseModel):
+    op: Literal["create", "update", "complete", "delete"]
+    todo_id: Optional[uuid.UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    completed: Optional[bool] = None
+
+
+class TodoBatchRequest(BaseModel):
+    operations: list[TodoBatchOperation]
+
+
+class TodoBulkCompleteRequest(BaseModel):
+    todo_ids: list[uuid.UUID]
+    completed: bool = True
+
+
+class TodoBulkDeleteRequest(BaseModel):
+    todo_ids: list[uuid.UUID]
+
+
+class TodoBatchResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    todo_id: Optional[uuid.UUID] = None
+    todo: Optional[TodoResponse] = None
+    error: Optional[str] = None
+
+
+class TodoBatchResponse(BaseModel):
+    results: list[TodoBatchResult]
+    succeeded: int
+    failed: int
 
 
 class ApiResponse(BaseModel):
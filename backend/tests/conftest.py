@@ -0,0 +1,123 @@
+"""
+Shared fixtures for the backend tests
+
+The app runs against a throwaway SQLite database through its real
+lifespan. Dapr is replaced by an in-memory fake, and the outbox relay is
+stopped so tests drain it explicitly.
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+
+_DB_DIR = tempfile.mkdtemp(prefix="todo-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_DB_DIR, 'todo.db')}"
+os.environ["DATABASE_REPLICA_URLS"] = "[]"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import SQLModel
+import core.dapr_client as dapr_client_module
+import main
+from core.cache import todo_list_cache
+from core.outbox import outbox_relay
+from database.session import engine, recent_writers
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    # Let SQLAlchemy emit BEGIN itself so savepoints behave as on PostgreSQL
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine.sync_engine, "begin")
+def _begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+class FakeBulkPublishResponse:
+    failed_entries = []
+
+
+class FakeDaprClient:
+    """
+    Records pub/sub publishes and state store writes in memory
+    """
+
+    def __init__(self):
+        self.published = []
+        self.state = {}
+
+    async def publish_event(self, pubsub_name, topic_name, data, data_content_type=None, publish_metadata=None):
+        self.published.append((topic_name, data, dict(publish_metadata or {})))
+
+    async def publish_events(self, pubsub_name, topic_name, data, data_content_type=None, publish_metadata=None):
+        for payload in data:
+            self.published.append((topic_name, payload, dict(publish_metadata or {})))
+        return FakeBulkPublishResponse()
+
+    async def save_bulk_state(self, store_name, states, metadata=None):
+        for item in states:
+            self.state[item.key] = item.value
+
+    async def delete_state(self, store_name, key, **kwargs):
+        self.state.pop(key, None)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    main.init_dapr_client = lambda: None
+    with TestClient(main.app) as client:
+        client.portal.call(outbox_relay.stop)
+        yield client
+
+
+@pytest.fixture
+def client(app_client):
+    async def reset_database():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    app_client.portal.call(reset_database)
+    todo_list_cache.clear()
+    recent_writers.clear()
+    yield app_client
+
+
+@pytest.fixture
+def run(client):
+    """
+    Run a coroutine function on the app's event loop
+    """
+    def call(function, *args):
+        return client.portal.call(function, *args)
+    return call
+
+
+@pytest.fixture
+def dapr():
+    fake = FakeDaprClient()
+    dapr_client_module._dapr_client = fake
+    yield fake
+    dapr_client_module._dapr_client = None
+
+
+@pytest.fixture
+def user(client):
+    """
+    Register and log in a user, returning its id and auth headers
+    """
+    name = f"user{uuid.uuid4().hex[:8]}"
+    response = client.post("/api/v1/register", json={"email": f"{name}@example.com", "username": name, "password": "secret"})
+    assert response.status_code == 200, response.text
+    user_id = response.json()["id"]
+    response = client.post("/api/v1/login", params={"email": f"{name}@example.com", "password": "secret"})
+    assert response.status_code == 200, response.text
+    return user_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,60 @@
+"""
+Tests for JSON-RPC batches on the MCP WebSocket
+"""
+
+import json
+from agents.todo_agent import todo_agent  # noqa: F401  (registers the todo tools)
+
+MISSING_TASK_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def exchange(websocket, frame):
+    websocket.send_text(json.dumps(frame))
+    return json.loads(websocket.receive_text())
+
+
+def titles(client, user_id, headers):
+    todos = client.get(f"/api/v1/{user_id}/todos", headers=headers).json()["todos"]
+    return sorted(todo["title"] for todo in todos)
+
+
+def test_transactional_batch_commits_all_requests(client, user):
+    user_id, headers = user
+    with client.websocket_connect("/api/v1/mcp") as websocket:
+        responses = exchange(websocket, [
+            {"method": "call/add_task", "params": {"title": title, "user_id": user_id}, "id": title, "transactional": True}
+            for title in ("one", "two")
+        ])
+
+    assert [response["id"] for response in responses] == ["one", "two"]
+    assert all("result" in response for response in responses)
+    assert titles(client, user_id, headers) == ["one", "two"]
+
+
+def test_transactional_batch_rolls_back_when_one_request_fails(client, user):
+    user_id, headers = user
+    with client.websocket_connect("/api/v1/mcp") as websocket:
+        responses = exchange(websocket, [
+            {"method": "call/add_task", "params": {"title": "kept?", "user_id": user_id}, "id": "a", "transactional": True},
+            {"method": "call/delete_task", "params": {"task_id": MISSING_TASK_ID, "user_id": user_id}, "id": "b"}
+        ])
+
+    assert responses[0]["error"]["code"] == -32000
+    assert responses[0]["error"]["message"].startswith("Batch rolled back")
+    assert responses[1]["error"]["code"] == -32603
+    assert titles(client, user_id, headers) == []
+
+
+def test_plain_batch_answers_every_entry(client, user):
+    user_id, headers = user
+    with client.websocket_connect("/api/v1/mcp") as websocket:
+        responses = exchange(websocket, [
+            {"method": "call/add_task", "params": {"title": "independent", "user_id": user_id}, "id": "a"},
+            "not a request",
+            {"method": "call/delete_task", "params": {"task_id": MISSING_TASK_ID, "user_id": user_id}, "id": "c"}
+        ])
+
+    assert "result" in responses[0]
+    assert responses[1]["error"]["code"] == -32600
+    assert responses[2]["error"]["code"] == -32603
+    assert titles(client, user_id, headers) == ["independent"]
@@ -0,0 +1,58 @@
+"""
+Tests for the transactional outbox and its relay
+"""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.outbox import outbox_relay
+from core.serialization import loads
+from database.session import engine
+from models.outbox import OutboxEvent
+
+
+async def count_outbox_rows():
+    async with AsyncSession(engine) as session:
+        return (await session.execute(select(func.count()).select_from(OutboxEvent))).scalar_one()
+
+
+def test_relay_publishes_then_deletes_staged_events(client, run, dapr, user):
+    user_id, headers = user
+    todo = client.post(f"/api/v1/{user_id}/todos", json={"title": "relayed"}, headers=headers).json()
+    response = client.patch(f"/api/v1/{user_id}/todos/{todo['id']}/complete", json={"completed": True}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert run(count_outbox_rows) == 2
+
+    assert run(outbox_relay.drain_once) == 2
+    assert run(count_outbox_rows) == 0
+
+    events = [loads(data) for topic, data, _ in dapr.published if topic == "todo-events"]
+    assert [event["event_type"] for event in events] == ["todo.created", "todo.completed"]
+    assert all(metadata["partitionKey"] == user_id for topic, _, metadata in dapr.published if topic == "todo-events")
+    # Only the latest snapshot of the todo reaches the state topic and store
+    states = [loads(data) for topic, data, _ in dapr.published if topic == "todo-state"]
+    assert [state["completed"] for state in states] == [True]
+    assert loads(dapr.state[f"todo-{todo['id']}"])["completed"] is True
+
+
+def test_failed_publish_leaves_events_for_the_next_drain(client, run, dapr, user):
+    user_id, headers = user
+    client.post(f"/api/v1/{user_id}/todos", json={"title": "retried"}, headers=headers)
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("sidecar unavailable")
+
+    publish_event, dapr.publish_event = dapr.publish_event, fail
+    with pytest.raises(RuntimeError):
+        run(outbox_relay.drain_once)
+    assert run(count_outbox_rows) == 1
+
+    dapr.publish_event = publish_event
+    assert run(outbox_relay.drain_once) == 1
+    assert run(count_outbox_rows) == 0
+
+
+def test_nothing_is_staged_without_a_dapr_client(client, run, user):
+    user_id, headers = user
+    client.post(f"/api/v1/{user_id}/todos", json={"title": "unrelayed"}, headers=headers)
+    assert run(count_outbox_rows) == 0
@@ -0,0 +1,88 @@
+"""
+Tests for the todo list endpoint: keyset pagination and the list cache
+"""
+
+from uuid import UUID
+from core.cache import todo_list_cache
+from database.session import write_session, recent_writers
+from database import todo_repository
+
+
+def create_todos(client, user_id, headers, titles):
+    for title in titles:
+        response = client.post(f"/api/v1/{user_id}/todos", json={"title": title}, headers=headers)
+        assert response.status_code == 200, response.text
+
+
+def test_pages_follow_the_cursor_without_gaps_or_repeats(client, user):
+    user_id, headers = user
+    titles = [f"todo {index}" for index in range(5)]
+    create_todos(client, user_id, headers, titles)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get(f"/api/v1/{user_id}/todos", params=params, headers=headers).json()
+        assert page["count"] == len(page["todos"]) <= 2
+        seen.extend(todo["title"] for todo in page["todos"])
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            break
+        cursor = page["next_cursor"]
+
+    assert seen == titles
+
+
+def test_descending_order_reverses_the_pages(client, user):
+    user_id, headers = user
+    create_todos(client, user_id, headers, ["first", "second", "third"])
+
+    page = client.get(f"/api/v1/{user_id}/todos", params={"limit": 2, "order": "desc"}, headers=headers).json()
+    assert [todo["title"] for todo in page["todos"]] == ["third", "second"]
+    page = client.get(
+        f"/api/v1/{user_id}/todos",
+        params={"limit": 2, "order": "desc", "cursor": page["next_cursor"]},
+        headers=headers
+    ).json()
+    assert [todo["title"] for todo in page["todos"]] == ["first"]
+    assert page["has_more"] is False
+
+
+def test_malformed_cursors_are_rejected(client, user):
+    user_id, headers = user
+    for cursor in ["not-base64!", "bm90IGpzb24=", "WyJub3QgYSBkYXRlIiwgIngiXQ=="]:
+        response = client.get(f"/api/v1/{user_id}/todos", params={"cursor": cursor}, headers=headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_commit_invalidates_the_cached_list(client, run, user):
+    user_id, headers = user
+    create_todos(client, user_id, headers, ["cached"])
+    # Leave the read-your-writes window so reads go through the cache
+    recent_writers.clear()
+
+    client.get(f"/api/v1/{user_id}/todos", headers=headers)
+    cache_key = (user_id, None, 50, None, "asc")
+    assert todo_list_cache.get(cache_key) is not None
+
+    async def write():
+        async with write_session() as session:
+            await todo_repository.create_todo(session, UUID(user_id), "uncached")
+            await todo_repository.commit(session)
+
+    run(write)
+    assert todo_list_cache.get(cache_key) is None
+    recent_writers.clear()
+    todos = client.get(f"/api/v1/{user_id}/todos", headers=headers).json()["todos"]
+    assert [todo["title"] for todo in todos] == ["cached", "uncached"]
+
+
+def test_reads_in_the_read_your_writes_window_bypass_the_cache(client, user):
+    user_id, headers = user
+    create_todos(client, user_id, headers, ["fresh"])
+
+    client.get(f"/api/v1/{user_id}/todos", headers=headers)
+    assert todo_list_cache.get((user_id, None, 50, None, "asc")) is None
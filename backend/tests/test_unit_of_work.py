@@ -0,0 +1,69 @@
+"""
+Tests for units of work shared by the tools of a chat turn
+"""
+
+import asyncio
+import json
+import threading
+from uuid import UUID
+from agents.todo_agent import todo_agent
+from core.cache import todo_list_cache
+from database.session import unit_of_work, write_session
+from database import todo_repository
+
+
+def test_cached_list_is_invalidated_by_the_unit_of_work_commit(client, user):
+    user_id, headers = user
+    assert client.get(f"/api/v1/{user_id}/todos", headers=headers).json()["todos"] == []
+
+    written = threading.Event()
+    finish = threading.Event()
+    versions = {}
+
+    async def turn():
+        async with unit_of_work():
+            async with write_session() as session:
+                await todo_repository.create_todo(session, UUID(user_id), "inside the turn")
+                await todo_repository.commit(session)
+            # The savepoint is released here; the todo is still uncommitted
+            versions["during"] = todo_list_cache.version(user_id)
+            written.set()
+            while not finish.is_set():
+                await asyncio.sleep(0.01)
+        versions["after"] = todo_list_cache.version(user_id)
+
+    pending = client.portal.start_task_soon(turn)
+    assert written.wait(5)
+    # A read while the turn is open still sees the committed (empty) list
+    assert client.get(f"/api/v1/{user_id}/todos", headers=headers).json()["todos"] == []
+    finish.set()
+    pending.result(5)
+
+    assert versions["after"] != versions["during"]
+    todos = client.get(f"/api/v1/{user_id}/todos", headers=headers).json()["todos"]
+    assert [todo["title"] for todo in todos] == ["inside the turn"]
+
+
+class ToolCall:
+    def __init__(self, call_id, name, arguments):
+        self.id = call_id
+        self.function = type("Function", (), {"name": name, "arguments": json.dumps(arguments)})()
+
+
+def test_failing_tool_call_does_not_undo_the_rest_of_the_turn(client, run, user):
+    user_id, headers = user
+    tool_calls = [
+        ToolCall("1", "add_task", {"title": "first"}),
+        # A title is required, so this insert fails in the database
+        ToolCall("2", "add_task", {"title": None}),
+        ToolCall("3", "add_task", {"title": "third"})
+    ]
+
+    async def turn():
+        async with unit_of_work():
+            return await todo_agent.execute_tool_calls(tool_calls, user_id)
+
+    results = run(turn)
+    assert [result["success"] for result in results] == [True, False, True]
+    todos = client.get(f"/api/v1/{user_id}/todos", headers=headers).json()["todos"]
+    assert sorted(todo["title"] for todo in todos) == ["first", "third"]
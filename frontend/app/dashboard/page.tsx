@@ -21,6 +21,7 @@ interface Todo {
 export default function Dashboard() {
   const router = useRouter()
   const [todos, setTodos] = useState<Todo[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
 
@@ -45,6 +46,7 @@ export default function Dashboard() {
       }
       const response = await getUserTodos(userId)
       setTodos(response.todos || [])
+      setNextCursor(response.next_cursor || null)
     } catch (err) {
       setError('Failed to load todos')
       console.error('Load todos error:', err)
@@ -53,6 +55,26 @@ export default function Dashboard() {
     }
   }
 
+  const loadMoreTodos = async () => {
+    if (!nextCursor) return
+    try {
+      const userId = getCurrentUserId()
+      if (!userId) {
+        throw new Error('User ID not found in token')
+      }
+      const response = await getUserTodos(userId, nextCursor)
+      // Todos added since the first page was loaded are already shown; skip them
+      setTodos(current => {
+        const shown = new Set(current.map(todo => todo.id))
+        return [...current, ...(response.todos || []).filter((todo: Todo) => !shown.has(todo.id))]
+      })
+      setNextCursor(response.next_cursor || null)
+    } catch (err) {
+      setError('Failed to load todos')
+      console.error('Load todos error:', err)
+    }
+  }
+
   const handleAddTodo = async (title: string, description?: string) => {
     try {
       const userId = getCurrentUserId()
@@ -217,6 +239,16 @@ export default function Dashboard() {
               ))
             )}
           </ul>
+          {nextCursor && (
+            <div className="px-6 py-4 border-t border-gray-200 text-center">
+              <button
+                onClick={loadMoreTodos}
+                className="text-sm font-medium text-indigo-600 hover:text-indigo-800"
+              >
+                Load more
+              </button>
+            </div>
+          )}
         </div>
       </main>
     </div>
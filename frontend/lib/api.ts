@@ -4,6 +4,10 @@
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || 'http://localhost:8000/api/v1'
 
+// Echoed back so reads right after a write are served from the primary database
+const READ_PRIMARY_HEADER = 'X-Read-Primary-Until'
+let readPrimaryUntil: string | null = null
+
 interface ApiOptions {
   method?: string
   headers?: Record<string, string>
@@ -24,6 +28,7 @@ export async function apiRequest(
     headers: {
       'Content-Type': 'application/json',
       ...(token && { 'Authorization': `Bearer ${token}` }),
+      ...(readPrimaryUntil && { [READ_PRIMARY_HEADER]: readPrimaryUntil }),
       ...options.headers,
     },
   }
@@ -34,6 +39,7 @@ export async function apiRequest(
 
   try {
     const response = await fetch(`${API_BASE_URL}${endpoint}`, config)
+    readPrimaryUntil = response.headers.get(READ_PRIMARY_HEADER) ?? readPrimaryUntil
     
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({}))
@@ -102,10 +108,11 @@ export async function loginUser(credentials: { email: string; password: string }
 }
 
 /**
- * Gets all todos for a user
+ * Gets a page of todos for a user
  */
-export async function getUserTodos(userId: string) {
-  return apiRequest(`/${userId}/todos`)
+export async function getUserTodos(userId: string, cursor?: string) {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''
+  return apiRequest(`/${userId}/todos${query}`)
 }
 
 /**
@@ -0,0 +1,197 @@
+"""
+Event deduplication for todo event consumers
+"""
+
+from collections import OrderedDict
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteDedupBackend:
+    """Persistent window of processed event IDs in a local SQLite file"""
+
+    def __init__(self, path: str = "processed_events.db", retention_seconds: float = 7 * 24 * 3600):
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_events "
+            "(event_id TEXT PRIMARY KEY, processed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_processed_events_processed_at ON processed_events (processed_at)"
+        )
+        self._conn.commit()
+
+    def contains(self, event_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of event_ids already recorded"""
+        event_ids = list(event_ids)
+        if not event_ids:
+            return set()
+        placeholders = ",".join("?" * len(event_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT event_id FROM processed_events WHERE event_id IN ({placeholders})",
+                event_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def add_many(self, event_ids: List[str]):
+        """Record processed event IDs"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO processed_events (event_id, processed_at) VALUES (?, ?)",
+                [(event_id, now) for event_id in event_ids]
+            )
+            self._conn.commit()
+
+    def prune(self):
+        """Forget event IDs older than the retention window"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM processed_events WHERE processed_at < ?",
+                (time.time() - self.retention_seconds,)
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+
+class PostgresDedupBackend:
+    """Persistent window of processed event IDs in PostgreSQL, shared by every consumer instance"""
+
+    def __init__(self, dsn: str, retention_seconds: float = 7 * 24 * 3600):
+        try:
+            import psycopg2
+        except ImportError:
+            raise RuntimeError("PostgresDedupBackend requires psycopg2 to be installed")
+
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn = psycopg2.connect(dsn)
+        self._conn.autocommit = True
+        with self._conn.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS processed_events "
+                "(event_id TEXT PRIMARY KEY, processed_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS ix_processed_events_processed_at ON processed_events (processed_at)"
+            )
+
+    def contains(self, event_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of event_ids already recorded"""
+        event_ids = list(event_ids)
+        if not event_ids:
+            return set()
+        with self._lock, self._conn.cursor() as cursor:
+            cursor.execute("SELECT event_id FROM processed_events WHERE event_id = ANY(%s)", (event_ids,))
+            rows = cursor.fetchall()
+        return {row[0] for row in rows}
+
+    def add_many(self, event_ids: List[str]):
+        """Record processed event IDs"""
+        with self._lock, self._conn.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO processed_events (event_id) SELECT unnest(%s::text[]) ON CONFLICT DO NOTHING",
+                (event_ids,)
+            )
+
+    def prune(self):
+        """Forget event IDs older than the retention window"""
+        with self._lock, self._conn.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM processed_events WHERE processed_at < now() - make_interval(secs => %s)",
+                (self.retention_seconds,)
+            )
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+
+class EventDeduplicator:
+    """
+    Remembers processed event IDs so redelivered events are skipped
+
+    Recent IDs live in a bounded in-memory LRU, so a duplicate costs one
+    dict lookup. An optional persistent backend extends the window across
+    restarts and rebalances; `preload` fetches a whole batch's IDs from it
+    in one query so replays do not hit the database once per event.
+    Events are marked only after their handler succeeds, so a failed event
+    is retried rather than skipped; marks reach the backend on `commit`,
+    once the batch's effects are durable.
+    """
+
+    def __init__(self, max_entries: int = 100000, backend=None, prune_every: int = 10000):
+        self.max_entries = max_entries
+        self.backend = backend
+        self.prune_every = prune_every
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._committed = 0
+        self.duplicates = 0
+
+    def preload(self, event_ids: Iterable[str]):
+        """Pull the IDs the backend has already recorded into memory"""
+        if self.backend is None:
+            return
+        with self._lock:
+            unknown = [event_id for event_id in event_ids if event_id not in self._seen]
+        for event_id in self.backend.contains(unknown):
+            self._remember(event_id)
+
+    def seen(self, event_id: Optional[str]) -> bool:
+        """Check whether an event was already processed; events without an ID never are"""
+        if event_id is None:
+            return False
+        with self._lock:
+            if event_id in self._seen:
+                self._seen.move_to_end(event_id)
+                self.duplicates += 1
+                return True
+        return False
+
+    def mark(self, event_id: Optional[str]):
+        """Record that an event was processed"""
+        if event_id is None:
+            return
+        self._remember(event_id)
+        if self.backend is not None:
+            with self._lock:
+                self._pending.append(event_id)
+
+    def commit(self):
+        """Write the IDs marked since the last commit to the backend in one batch"""
+        if self.backend is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        self.backend.add_many(pending)
+        previous, self._committed = self._committed, self._committed + len(pending)
+        if previous // self.prune_every != self._committed // self.prune_every:
+            self.backend.prune()
+
+    def _remember(self, event_id: str):
+        with self._lock:
+            self._seen[event_id] = None
+            self._seen.move_to_end(event_id)
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+
+    def close(self):
+        """Release the persistent backend"""
+        if self.backend is not None:
+            self.backend.close()
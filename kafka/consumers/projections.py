@@ -0,0 +1,133 @@
+"""
+Read-model projections maintained from todo events
+"""
+
+from collections import defaultdict
+import threading
+from datetime import datetime
+from typing import Dict, Any, Tuple
+import logging
+from events.schema import SchemaError
+
+logger = logging.getLogger(__name__)
+
+
+def _event_day(event: Dict[str, Any]) -> str:
+    """The UTC day an event happened on, as YYYY-MM-DD"""
+    timestamp = event.get("timestamp")
+    return timestamp[:10] if timestamp else datetime.utcnow().date().isoformat()
+
+
+class UserStatsProjection:
+    """
+    Per-user todo counters kept in the `user_todo_stats` and
+    `user_todo_daily_stats` tables read by the stats endpoint
+
+    Events only adjust in-memory deltas; `flush` writes a whole batch's
+    deltas as two multi-row upserts in one transaction. The consumer
+    flushes before it records the batch with the event deduplicator and
+    commits offsets, so a crash replays the batch rather than losing it;
+    only a crash between the flush and the deduplicator commit can count
+    a batch twice. The tables are created by the backend.
+    """
+
+    def __init__(self, dsn: str):
+        try:
+            import psycopg2
+            import psycopg2.extras
+        except ImportError:
+            raise RuntimeError("UserStatsProjection requires psycopg2 to be installed")
+
+        self._extras = psycopg2.extras
+        self._conn = psycopg2.connect(dsn)
+        self._lock = threading.Lock()
+        # user_id -> [total delta, completed delta]
+        self._totals: Dict[str, list] = defaultdict(lambda: [0, 0])
+        # (user_id, day) -> [created delta, completed delta]
+        self._daily: Dict[Tuple[str, str], list] = defaultdict(lambda: [0, 0])
+
+    def apply(self, event: Dict[str, Any]):
+        """
+        Fold one todo event into the pending deltas
+
+        Completion and delete events must carry the todo's previous state
+        (`original_completed`, `todo_data.completed`); without it the
+        counters cannot be adjusted correctly, so such an event raises
+        SchemaError and changes nothing.
+        """
+        user_id = event.get("user_id")
+        if user_id is None:
+            return
+        event_type = event.get("event_type")
+        day = _event_day(event)
+
+        if event_type in ("todo.completed", "todo.uncompleted"):
+            if not isinstance(event.get("original_completed"), bool):
+                raise SchemaError(f"{event_type} event {event.get('event_id')} has no original_completed")
+        elif event_type == "todo.deleted":
+            snapshot = event.get("todo_data")
+            if not isinstance(snapshot, dict) or not isinstance(snapshot.get("completed"), bool):
+                raise SchemaError(f"todo.deleted event {event.get('event_id')} has no todo_data snapshot")
+
+        with self._lock:
+            if event_type == "todo.created":
+                self._totals[user_id][0] += 1
+                self._daily[(user_id, day)][0] += 1
+
+            elif event_type in ("todo.completed", "todo.uncompleted"):
+                completed = event_type == "todo.completed"
+                # Setting the flag to its current value (e.g. a bulk complete) is not a transition
+                if event.get("original_completed") == completed:
+                    return
+                self._totals[user_id][1] += 1 if completed else -1
+                if completed:
+                    self._daily[(user_id, day)][1] += 1
+
+            elif event_type == "todo.deleted":
+                self._totals[user_id][0] -= 1
+                if event["todo_data"]["completed"]:
+                    self._totals[user_id][1] -= 1
+
+    def flush(self):
+        """Write the pending deltas with batched upserts"""
+        with self._lock:
+            totals, self._totals = self._totals, defaultdict(lambda: [0, 0])
+            daily, self._daily = self._daily, defaultdict(lambda: [0, 0])
+        totals = {user_id: delta for user_id, delta in totals.items() if delta != [0, 0]}
+        daily = {key: delta for key, delta in daily.items() if delta != [0, 0]}
+        if not totals and not daily:
+            return
+
+        with self._conn, self._conn.cursor() as cursor:
+            if totals:
+                self._extras.execute_values(
+                    cursor,
+                    "INSERT INTO user_todo_stats (user_id, total, completed, updated_at) VALUES %s "
+                    "ON CONFLICT (user_id) DO UPDATE SET "
+                    "total = user_todo_stats.total + EXCLUDED.total, "
+                    "completed = user_todo_stats.completed + EXCLUDED.completed, "
+                    "updated_at = EXCLUDED.updated_at",
+                    [(user_id, total, completed, datetime.utcnow()) for user_id, (total, completed) in totals.items()]
+                )
+            if daily:
+                self._extras.execute_values(
+                    cursor,
+                    "INSERT INTO user_todo_daily_stats (user_id, day, created, completed) VALUES %s "
+                    "ON CONFLICT (user_id, day) DO UPDATE SET "
+                    "created = user_todo_daily_stats.created + EXCLUDED.created, "
+                    "completed = user_todo_daily_stats.completed + EXCLUDED.completed",
+                    [(user_id, day, created, completed) for (user_id, day), (created, completed) in daily.items()]
+                )
+        logger.info(f"Projected stats for {len(totals)} users and {len(daily)} user-days")
+
+    def reset(self):
+        """Drop all projected counters and pending deltas, ahead of a rebuild"""
+        with self._lock:
+            self._totals.clear()
+            self._daily.clear()
+        with self._conn, self._conn.cursor() as cursor:
+            cursor.execute("TRUNCATE user_todo_stats, user_todo_daily_stats")
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
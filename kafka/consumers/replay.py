@@ -0,0 +1,219 @@
+"""
+Replay todo events to rebuild read-model projections
+
+Usage (from the kafka/ directory):
+
+    python -m consumers.replay --dsn postgresql://... --reset --from-timestamp 2024-01-01T00:00:00
+    python -m consumers.replay --dsn postgresql://... --reset --file events.jsonl
+
+Stop the live consumer while rebuilding. A replay from Kafka stops at the
+live consumer group's committed offsets, so when the consumer restarts it
+picks up exactly where the rebuilt counters end. Redelivered events are
+skipped by `event_id`, as the live consumer does. Kafka only holds the
+topic's retention window, so a rebuild from Kafka covers that window;
+replay an archived event file to go further back.
+"""
+
+from kafka import KafkaConsumer, TopicPartition
+import argparse
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import logging
+from .dedup import EventDeduplicator
+from .projections import UserStatsProjection
+from events.codec import CONTENT_TYPE_HEADER
+from events.schema import SchemaError
+from .todo_consumer import CONSUMER_GROUP, TODO_EVENTS_TOPIC, decode_event
+
+logger = logging.getLogger(__name__)
+
+# A serialized event and its content type (None for JSON)
+Record = Tuple[bytes, Optional[bytes]]
+
+
+def read_file(path: str, batch_size: int) -> Iterator[List[Record]]:
+    """Yield batches of serialized events from a file with one JSON event per line"""
+    batch = []
+    with open(path, "rb") as events_file:
+        for line in events_file:
+            line = line.strip()
+            if line:
+                batch.append((line, None))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def read_topic(
+    bootstrap_servers: str,
+    batch_size: int,
+    from_offset: Optional[int] = None,
+    from_timestamp: Optional[datetime] = None,
+    topic: str = TODO_EVENTS_TOPIC,
+    group_id: str = CONSUMER_GROUP
+) -> Iterator[List[Record]]:
+    """
+    Yield batches of serialized events from every partition of a topic
+
+    Reading starts at `from_offset` in each partition, at the first event
+    at or after `from_timestamp`, or at the beginning, and stops at the
+    offsets `group_id` has committed. Everything past them is left to the
+    live consumer, so no event is applied by both. A partition the group
+    has never committed is not replayed, since the live consumer will
+    read it from the beginning.
+    """
+    consumer = KafkaConsumer(
+        bootstrap_servers=bootstrap_servers,
+        # Only used to look up the group's committed offsets: assigned
+        # partitions never join the group, and nothing is committed
+        group_id=group_id,
+        enable_auto_commit=False,
+        max_poll_records=batch_size,
+        fetch_max_bytes=64 * 1024 * 1024,
+        max_partition_fetch_bytes=16 * 1024 * 1024
+    )
+    try:
+        partitions = [TopicPartition(topic, partition) for partition in consumer.partitions_for_topic(topic) or ()]
+        consumer.assign(partitions)
+        beginning_offsets = consumer.beginning_offsets(partitions)
+        end_offsets = {}
+        for partition in partitions:
+            committed = consumer.committed(partition)
+            end_offsets[partition] = committed if committed is not None else beginning_offsets[partition]
+
+        if from_timestamp is not None:
+            starts = consumer.offsets_for_times(
+                {partition: int(from_timestamp.timestamp() * 1000) for partition in partitions}
+            )
+            for partition in partitions:
+                found = starts.get(partition)
+                consumer.seek(partition, found.offset if found is not None else end_offsets[partition])
+        elif from_offset is not None:
+            for partition in partitions:
+                consumer.seek(partition, from_offset)
+        else:
+            consumer.seek_to_beginning(*partitions)
+
+        remaining = {partition for partition in partitions if consumer.position(partition) < end_offsets[partition]}
+        while remaining:
+            records = consumer.poll(timeout_ms=1000, max_records=batch_size)
+            batch = []
+            for partition, messages in records.items():
+                batch.extend(
+                    (message.value, dict(message.headers or []).get(CONTENT_TYPE_HEADER))
+                    for message in messages
+                    if message.offset < end_offsets[partition]
+                )
+            for partition in list(remaining):
+                if consumer.position(partition) >= end_offsets[partition]:
+                    remaining.discard(partition)
+                    consumer.pause(partition)
+            if batch:
+                yield batch
+    finally:
+        consumer.close()
+
+
+def replay(
+    batches: Iterator[List[Record]],
+    projection: UserStatsProjection,
+    report_every: float = 5.0,
+    dedup_window: int = 1000000
+) -> Dict[str, Any]:
+    """
+    Apply batches of serialized events to a projection, flushing once per batch
+
+    Events whose `event_id` was already applied within the last
+    `dedup_window` events are skipped, so redeliveries from the outbox are
+    counted once, as they are by the live consumer. Events the projection
+    rejects for lacking the todo's previous state are left out and
+    counted, as the live consumer dead-letters them. Progress is logged
+    every `report_every` seconds rather than per event. Returns the totals
+    and the overall rate of applied events.
+    """
+    deduplicator = EventDeduplicator(max_entries=dedup_window)
+    started = last_report = time.monotonic()
+    events = skipped = duplicates = rejected = 0
+
+    for batch in batches:
+        for value, content_type in batch:
+            event = decode_event(value, content_type)
+            if event is None:
+                skipped += 1
+                continue
+            event_id = event.get('event_id')
+            if deduplicator.seen(event_id):
+                duplicates += 1
+                continue
+            try:
+                projection.apply(event)
+            except SchemaError as e:
+                logger.debug(f"Rejected event: {e}")
+                rejected += 1
+                continue
+            deduplicator.mark(event_id)
+            events += 1
+        projection.flush()
+
+        now = time.monotonic()
+        if now - last_report >= report_every:
+            logger.info(f"Replayed {events} events ({events / (now - started):.0f} events/s)")
+            last_report = now
+
+    elapsed = time.monotonic() - started
+    return {
+        "events": events,
+        "skipped": skipped,
+        "duplicates": duplicates,
+        "rejected": rejected,
+        "seconds": elapsed,
+        "events_per_second": events / elapsed if elapsed else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay todo events to rebuild the user statistics projection")
+    parser.add_argument("--dsn", required=True, help="libpq DSN of the backend database")
+    parser.add_argument("--reset", action="store_true", help="Truncate the projection before replaying")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--file", help="Replay a file with one serialized event per line instead of Kafka")
+    parser.add_argument("--bootstrap-servers", default="localhost:9092")
+    parser.add_argument("--group-id", default=CONSUMER_GROUP, help="Live consumer group whose committed offsets end the replay")
+    parser.add_argument("--dedup-window", type=int, default=1000000, help="Number of recent event IDs checked for duplicates")
+    start = parser.add_mutually_exclusive_group()
+    start.add_argument("--from-offset", type=int, help="Start every partition at this offset")
+    start.add_argument("--from-timestamp", type=datetime.fromisoformat, help="Start at the first event at or after this ISO time")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # Per-batch flush logging would drown out the progress reports
+    logging.getLogger("consumers.projections").setLevel(logging.WARNING)
+
+    projection = UserStatsProjection(args.dsn)
+    try:
+        if args.reset:
+            projection.reset()
+        else:
+            logger.warning("Replaying without --reset adds to the existing counters")
+
+        if args.file:
+            batches = read_file(args.file, args.batch_size)
+        else:
+            batches = read_topic(
+                args.bootstrap_servers, args.batch_size, args.from_offset, args.from_timestamp, group_id=args.group_id
+            )
+        result = replay(batches, projection, dedup_window=args.dedup_window)
+    finally:
+        projection.close()
+
+    logger.info(
+        f"Replayed {result['events']} events ({result['skipped']} undecodable, {result['duplicates']} duplicates, {result['rejected']} rejected) in "
+        f"{result['seconds']:.1f}s: {result['events_per_second']:.0f} events/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
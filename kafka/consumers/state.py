@@ -0,0 +1,91 @@
+"""
+Bootstrap loader for the compacted todo-state topic
+
+Usage (from the kafka/ directory):
+
+    python -m consumers.state --bootstrap-servers kafka:9092
+"""
+
+from kafka import KafkaConsumer, TopicPartition
+import argparse
+import time
+from typing import Dict, Any
+import logging
+from events.codec import CONTENT_TYPE_HEADER, decode
+
+logger = logging.getLogger(__name__)
+
+TODO_STATE_TOPIC = 'todo-state'
+
+
+def load_todo_state(
+    bootstrap_servers: str = "localhost:9092",
+    topic: str = TODO_STATE_TOPIC,
+    batch_size: int = 10000
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the todo-state topic from the beginning into a map of todo id to latest snapshot
+
+    The topic is log-compacted and keyed by todo id, so the read is bounded
+    by the number of todos rather than by the event history. Later records
+    replace earlier ones for the same key; a tombstone (a null or empty
+    value) removes the todo. Reading stops at the end offsets seen when the
+    load started; follow `todo-events` from then on to stay current.
+    """
+    consumer = KafkaConsumer(
+        bootstrap_servers=bootstrap_servers,
+        group_id=None,  # Every loader reads the whole topic; there are no offsets to commit
+        enable_auto_commit=False,
+        max_poll_records=batch_size,
+        fetch_max_bytes=64 * 1024 * 1024,
+        max_partition_fetch_bytes=16 * 1024 * 1024
+    )
+    todos: Dict[str, Dict[str, Any]] = {}
+    try:
+        partitions = [TopicPartition(topic, partition) for partition in consumer.partitions_for_topic(topic) or ()]
+        consumer.assign(partitions)
+        consumer.seek_to_beginning(*partitions)
+        end_offsets = consumer.end_offsets(partitions)
+
+        remaining = {partition for partition in partitions if consumer.position(partition) < end_offsets[partition]}
+        while remaining:
+            records = consumer.poll(timeout_ms=1000, max_records=batch_size)
+            for partition, messages in records.items():
+                for message in messages:
+                    if message.key is None or message.offset >= end_offsets[partition]:
+                        continue
+                    todo_id = message.key.decode('utf-8')
+                    snapshot = None
+                    if message.value:
+                        try:
+                            snapshot = decode(message.value, dict(message.headers or []).get(CONTENT_TYPE_HEADER))
+                        except ValueError as e:
+                            logger.warning(f"Skipping undecodable snapshot of todo {todo_id}: {e}")
+                            continue
+                    if not isinstance(snapshot, dict):
+                        todos.pop(todo_id, None)
+                    else:
+                        todos[todo_id] = snapshot
+            for partition in list(remaining):
+                if consumer.position(partition) >= end_offsets[partition]:
+                    remaining.discard(partition)
+                    consumer.pause(partition)
+    finally:
+        consumer.close()
+    return todos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the latest state of every todo from the todo-state topic")
+    parser.add_argument("--bootstrap-servers", default="localhost:9092")
+    parser.add_argument("--topic", default=TODO_STATE_TOPIC)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    started = time.monotonic()
+    todos = load_todo_state(args.bootstrap_servers, args.topic)
+    logger.info(f"Loaded {len(todos)} todos in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
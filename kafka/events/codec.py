@@ -0,0 +1,74 @@
+"""
+Wire encodings for todo events
+
+Records carry their encoding in a `content-type` header. JSON is the
+default and the only encoding Dapr-published events use; MessagePack is
+a compact binary alternative for producers writing to Kafka directly and
+needs the optional `msgpack` package. Records without the header are
+JSON, which covers everything published before it existed. JSON goes
+through orjson when it is installed.
+"""
+
+from typing import Any, Optional, Union
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONTENT_TYPE_HEADER = 'content-type'
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+CONTENT_TYPES = (JSON, MSGPACK)
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise RuntimeError("MessagePack encoding requires msgpack to be installed")
+
+
+def encode(value: Any, content_type: str = JSON) -> bytes:
+    """Serialize a value with the given content type"""
+    if content_type == MSGPACK:
+        _require_msgpack()
+        return msgpack.packb(value, use_bin_type=True)
+    if content_type == JSON:
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+    raise ValueError(f"Unsupported content type: {content_type}")
+
+
+def decode(value: bytes, content_type: Optional[Union[str, bytes]] = None) -> Any:
+    """
+    Deserialize a record value, unwrapping a CloudEvents envelope if present
+
+    Raises ValueError if the value is not valid for its content type.
+    """
+    if isinstance(content_type, bytes):
+        content_type = content_type.decode('latin-1')
+    content_type = (content_type or JSON).split(';')[0].strip().lower()
+
+    if content_type == MSGPACK:
+        _require_msgpack()
+        try:
+            decoded = msgpack.unpackb(value, raw=False)
+        except Exception as e:
+            raise ValueError(f"Invalid MessagePack value: {e}") from e
+    elif content_type == JSON:
+        decoded = orjson.loads(value) if orjson is not None else json.loads(value)
+    else:
+        raise ValueError(f"Unsupported content type: {content_type}")
+
+    # Events published through Dapr arrive wrapped in a CloudEvents envelope
+    if isinstance(decoded, dict) and 'specversion' in decoded and 'data' in decoded:
+        decoded = decoded['data']
+        if isinstance(decoded, str):
+            decoded = orjson.loads(decoded) if orjson is not None else json.loads(decoded)
+    return decoded
@@ -0,0 +1,85 @@
+"""
+Versioned schemas for todo events
+
+Version 2 events are flat: every todo event carries `event_type`,
+`event_id`, `schema_version`, `todo_id`, `user_id` and `timestamp` at the
+top level, plus the fields listed for its type below. Version 1 events
+have no `schema_version`; the outbox already published them flat, while
+the producers nested the todo under `data`. `upgrade` rewrites older
+events to the current version so consumers only ever see one layout.
+"""
+
+from typing import Callable, Dict, Any, Tuple
+
+SCHEMA_VERSION = 2
+
+# Fields every todo event must carry
+COMMON_FIELDS: Tuple[str, ...] = ("event_type", "todo_id", "user_id", "timestamp")
+
+# Additional required fields per event type at the current version
+EVENT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "todo.created": ("title",),
+    "todo.updated": (),
+    "todo.completed": ("new_completed",),
+    "todo.uncompleted": ("new_completed",),
+    "todo.deleted": ()
+}
+
+
+class SchemaError(ValueError):
+    """Raised when an event does not match its schema"""
+
+
+def _upgrade_v1(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a version 1 event that nests the todo under `data`"""
+    data = event.get("data")
+    if not isinstance(data, dict):
+        return event
+
+    event_type = event.get("event_type")
+    upgraded = {key: value for key, value in event.items() if key != "data"}
+    upgraded["todo_id"] = data.get("todo_id") or data.get("id")
+    upgraded["user_id"] = data.get("user_id")
+    upgraded.setdefault("timestamp", data.get("timestamp"))
+
+    if event_type == "todo.created":
+        upgraded["title"] = data.get("title")
+        upgraded["description"] = data.get("description")
+    elif event_type == "todo.updated":
+        updates = data.get("updates", data)
+        if "title" in updates:
+            upgraded["updated_title"] = updates["title"]
+        if "description" in updates:
+            upgraded["updated_description"] = updates["description"]
+    elif event_type in ("todo.completed", "todo.uncompleted"):
+        upgraded["new_completed"] = data.get("completed", event_type == "todo.completed")
+    elif event_type == "todo.deleted" and "title" in data:
+        upgraded["todo_data"] = data
+    return upgraded
+
+
+# Functions that rewrite an event of the given version to the next one
+UPGRADERS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    1: _upgrade_v1
+}
+
+
+def upgrade(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite an event of any older version to the current schema version"""
+    version = event.get("schema_version", 1)
+    while version < SCHEMA_VERSION:
+        event = UPGRADERS[version](event)
+        version += 1
+    event["schema_version"] = version
+    return event
+
+
+def validate(event: Dict[str, Any]):
+    """Check that a todo event carries the fields its schema requires"""
+    required = EVENT_FIELDS.get(event.get("event_type"))
+    if required is None:
+        # Not a todo event (e.g. usage summaries); nothing to check
+        return
+    missing = [field for field in COMMON_FIELDS + required if event.get(field) is None]
+    if missing:
+        raise SchemaError(f"{event.get('event_type')} event is missing {', '.join(missing)}")
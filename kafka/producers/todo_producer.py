@@ -3,100 +3,219 @@ Kafka producer for todo events
 """
 
 from kafka import KafkaProducer
-import json
-from typing import Dict, Any
+from kafka.producer.future import FutureRecordMetadata
+import uuid
+from typing import Dict, Any, Iterable, List, Optional
 import logging
+from events.codec import CONTENT_TYPE_HEADER, CONTENT_TYPES, JSON, encode
+from events.schema import SCHEMA_VERSION, validate
 
 logger = logging.getLogger(__name__)
 
+TODO_EVENTS_TOPIC = 'todo-events'
+
 
 class TodoEventProducer:
-    def __init__(self, bootstrap_servers: str = "localhost:9092"):
+    """
+    Producer for todo events
+
+    With `blocking=True` (the default) each publish waits for its own record
+    to be acknowledged. With `blocking=False` publishes return the delivery
+    future immediately, records are batched by the client in the background,
+    and callers flush at checkpoints and at shutdown; attach callbacks with
+    `future.add_callback` / `future.add_errback` to observe delivery.
+
+    Events follow the current schema version and are encoded as
+    `content_type` (JSON, or MessagePack for smaller records), which is
+    sent in each record's content-type header.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str = "localhost:9092",
+        blocking: bool = True,
+        compression_type: Optional[str] = None,
+        linger_ms: int = 5,
+        batch_size: int = 16384,
+        delivery_timeout: float = 30.0,
+        content_type: str = JSON
+    ):
+        if content_type not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported content type: {content_type}")
+        self.blocking = blocking
+        self.content_type = content_type
+        self._headers = [(CONTENT_TYPE_HEADER, content_type.encode())]
+        self.delivery_timeout = delivery_timeout
         self.producer = KafkaProducer(
             bootstrap_servers=bootstrap_servers,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+            key_serializer=lambda k: k.encode('utf-8') if k is not None else None,
+            value_serializer=lambda v: encode(v, content_type),
             acks='all',  # Wait for all replicas to acknowledge
             retries=3,
-            linger_ms=5,  # Small wait time to batch messages
-            batch_size=16384  # Batch size for efficiency
+            linger_ms=linger_ms,  # Small wait time to batch messages
+            batch_size=batch_size,  # Batch size for efficiency
+            compression_type=compression_type  # None, 'gzip', 'snappy', 'lz4' or 'zstd'
         )
 
-    def publish_todo_created(self, todo_data: Dict[str, Any]):
+    def publish(self, event: Dict[str, Any]) -> FutureRecordMetadata:
+        """Publish one event, waiting for delivery only in blocking mode"""
+        future = self._send(event)
+        future.add_errback(self._log_delivery_failure, event)
+        if self.blocking:
+            future.get(timeout=self.delivery_timeout)
+        return future
+
+    def publish_many(self, events: Iterable[Dict[str, Any]]) -> List[FutureRecordMetadata]:
+        """
+        Publish several events as one batch
+
+        All records are handed to the client before any is awaited, so they
+        share request batches. In blocking mode this returns once every
+        record is acknowledged and raises the first delivery failure.
+        """
+        futures = []
+        for event in events:
+            future = self._send(event)
+            future.add_errback(self._log_delivery_failure, event)
+            futures.append(future)
+
+        if self.blocking:
+            self.flush()
+            for future in futures:
+                if future.failed():
+                    raise future.exception
+        return futures
+
+    def publish_todo_created(self, todo_data: Dict[str, Any]) -> FutureRecordMetadata:
         """Publish a todo created event"""
         event = {
             "event_type": "todo.created",
-            "data": todo_data,
+            "todo_id": todo_data.get("id"),
+            "user_id": todo_data.get("user_id"),
+            "title": todo_data.get("title"),
+            "description": todo_data.get("description"),
             "timestamp": self._get_timestamp()
         }
-        
+
         try:
-            future = self.producer.send('todo-events', event)
-            self.producer.flush()  # Wait for send to complete
+            future = self.publish(event)
             logger.info(f"Published todo.created event for todo {todo_data.get('id')}")
+            return future
         except Exception as e:
             logger.error(f"Failed to publish todo.created event: {e}")
             raise
 
-    def publish_todo_updated(self, todo_data: Dict[str, Any]):
+    def publish_todo_updated(self, todo_data: Dict[str, Any]) -> FutureRecordMetadata:
         """Publish a todo updated event"""
         event = {
             "event_type": "todo.updated",
-            "data": todo_data,
+            "todo_id": todo_data.get("id"),
+            "user_id": todo_data.get("user_id"),
+            "updated_title": todo_data.get("title"),
+            "updated_description": todo_data.get("description"),
             "timestamp": self._get_timestamp()
         }
-        
+
         try:
-            self.producer.send('todo-events', event)
-            self.producer.flush()
+            future = self.publish(event)
             logger.info(f"Published todo.updated event for todo {todo_data.get('id')}")
+            return future
         except Exception as e:
             logger.error(f"Failed to publish todo.updated event: {e}")
             raise
 
-    def publish_todo_deleted(self, todo_id: str, user_id: str):
-        """Publish a todo deleted event"""
+    def publish_todo_deleted(self, todo_data: Dict[str, Any]) -> FutureRecordMetadata:
+        """
+        Publish a todo deleted event
+
+        `todo_data` is the todo as it was before deletion; consumers need
+        its `completed` flag to keep their counters right.
+        """
+        todo_id = todo_data.get("id")
         event = {
             "event_type": "todo.deleted",
-            "data": {
-                "id": todo_id,
-                "user_id": user_id
-            },
+            "todo_id": todo_id,
+            "user_id": todo_data.get("user_id"),
+            "todo_data": todo_data,
             "timestamp": self._get_timestamp()
         }
-        
+
         try:
-            self.producer.send('todo-events', event)
-            self.producer.flush()
+            future = self.publish(event)
             logger.info(f"Published todo.deleted event for todo {todo_id}")
+            return future
         except Exception as e:
             logger.error(f"Failed to publish todo.deleted event: {e}")
             raise
 
-    def publish_todo_completed(self, todo_id: str, user_id: str, completed: bool):
-        """Publish a todo completion status change event"""
+    def publish_todo_completed(
+        self,
+        todo_id: str,
+        user_id: str,
+        completed: bool,
+        original_completed: bool
+    ) -> FutureRecordMetadata:
+        """
+        Publish a todo completion status change event
+
+        `original_completed` is the flag before the change, so consumers
+        can tell a real transition from setting the flag to its current value.
+        """
         event = {
             "event_type": "todo.completed" if completed else "todo.uncompleted",
-            "data": {
-                "id": todo_id,
-                "user_id": user_id,
-                "completed": completed
-            },
+            "todo_id": todo_id,
+            "user_id": user_id,
+            "original_completed": original_completed,
+            "new_completed": completed,
             "timestamp": self._get_timestamp()
         }
-        
+
         try:
-            self.producer.send('todo-events', event)
-            self.producer.flush()
+            future = self.publish(event)
             logger.info(f"Published todo.completed event for todo {todo_id}")
+            return future
         except Exception as e:
             logger.error(f"Failed to publish todo.completed event: {e}")
             raise
 
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every buffered event has been sent (a delivery checkpoint)"""
+        self.producer.flush(timeout=timeout if timeout is not None else self.delivery_timeout)
+
+    def _send(self, event: Dict[str, Any]) -> FutureRecordMetadata:
+        """Stamp an event with an ID and the schema version, check it and hand it to the client"""
+        event.setdefault("event_id", str(uuid.uuid4()))
+        event.setdefault("schema_version", SCHEMA_VERSION)
+        validate(event)
+        return self.producer.send(
+            TODO_EVENTS_TOPIC,
+            value=event,
+            key=self._partition_key(event),
+            headers=self._headers
+        )
+
+    def _partition_key(self, event: Dict[str, Any]) -> Optional[str]:
+        """Key events by user so each user's events stay on one partition in order"""
+        user_id = event.get("user_id")
+        return str(user_id) if user_id is not None else None
+
+    def _log_delivery_failure(self, event: Dict[str, Any], error: Exception):
+        logger.error(f"Failed to deliver {event.get('event_type')} event: {error}")
+
     def _get_timestamp(self) -> str:
         """Get ISO formatted timestamp"""
         from datetime import datetime
         return datetime.utcnow().isoformat()
 
     def close(self):
-        """Close the producer"""
-        self.producer.close()
\ No newline at end of file
+        """Flush buffered events and close the producer"""
+        try:
+            self.flush()
+        finally:
+            self.producer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()